@@ -7,20 +7,26 @@ GitHub entegrasyonu, bağımlılık yönetimi, otomatik güncellemeler ve sertif
 import os
 import sys
 import json
-import subprocess
-import urllib.request
-import urllib.error
 import re
-import shutil
 import hashlib
 import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-import tarfile
-import tempfile
-import base64
-import secrets
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import threading
+import atexit
+import mmap
+import struct
+import zlib
+import glob
+import io
+import contextlib
+import functools
+
+if TYPE_CHECKING:
+    # Yalnızca tip açıklamaları için; çalışma anında ağ modülleri kullanıldıkları yerde yüklenir
+    import http.client
+    import urllib.parse
 
 # Renkli çıktı için ANSI kodları
 class Colors:
@@ -43,22 +49,81 @@ INSTALLED_DB = ALP_HOME / "installed.json"
 CONFIG_FILE = ALP_HOME / "config.json"
 INSTALLED_DIR = ALP_HOME / "installed"
 CERTIFICATES_DB = ALP_HOME / "certificates.json"
+STATE_DB = ALP_HOME / "state.db"
+DIGEST_CACHE_FILE = ALP_HOME / "digests.json"
+REVDEPS_DB = ALP_HOME / "revdeps.json"
+SEARCH_INDEX_DB = ALP_HOME / "search_index.json"
+DOCTOR_JOURNAL = ALP_HOME / "doctor.json"
+USER_AGENT = "Alp-PackageManager/1.0"
+HTTP_CACHE_DIR = ALP_CACHE / "http"
+NEGATIVE_CACHE_FILE = ALP_CACHE / "negative.json"
+CACHE_ACCESS_FILE = ALP_CACHE / "access.json"
+OBJECTS_DIR = ALP_CACHE / "objects"
+OBJECT_REFS_FILE = ALP_CACHE / "refs.json"
+DEFAULT_BRANCHES = ["main", "master"]
+MIRROR_FILES = ("README.md", "alp.sh", "alp_u.sh", "cerf.alpc")
+CHUNK_SIZE = 64 * 1024
+MMAP_THRESHOLD = 8 * 1024 * 1024
 
 # Official Sertifika için şifreli anahtar (SHA-256)
 OFFICIAL_CERT_KEY = "cefa8faf107f512c2382150e70953e5839d882698709d6accc1ad49651732c95"  # "password" kelimesinin SHA-256 hash'i
 
 class Logger:
-    """Gelişmiş loglama sistemi"""
+    """Gelişmiş loglama sistemi.
+    
+    Kayıtlar bellekte biriktirilip toplu yazılır (ERROR'da, tampon dolunca ve
+    çıkışta). Tek bir alp.log dosyası boyut ya da gün değişince alp.log.1..N
+    olarak döndürülür; yedek sayısı ve yaşı sınırlıdır. log_level altındaki
+    kayıtlar dosyaya hiç girmez, log_format "json" ise satırlar JSON olur.
+    """
+    LEVELS = {"DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40}
+    BUFFER_SIZE = 64
+    
     def __init__(self):
-        ALP_LOGS.mkdir(parents=True, exist_ok=True)
-        self.log_file = ALP_LOGS / f"alp_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        self.log_file = ALP_LOGS / "alp.log"
+        self.level = self.LEVELS["INFO"]
+        self.json_format = False
+        self.max_bytes = 1024 * 1024
+        self.backups = 5
+        self.max_age = 7 * 86400
+        self._buffer: List[str] = []
+        self._checked = False
+        # Makine okunur çıktı modunda konsol mesajları renksiz olarak stderr'e gider
+        self.plain_stderr = False
+        # Paralel depo güncellemesinde satırların birbirine karışmaması için
+        self._lock = threading.RLock()
+        atexit.register(self.flush)
+        if hasattr(os, "register_at_fork"):
+            # Çatallanan süreç ebeveynin tamponunu ikinci kez yazmasın
+            os.register_at_fork(after_in_child=self._buffer.clear)
+    
+    def configure(self, config: Dict) -> None:
+        """log_level, log_format, log_max_kb, log_backups, log_max_age_days ayarlarını uygula"""
+        self.level = self.LEVELS.get(str(config.get("log_level", "INFO")).upper(), self.LEVELS["INFO"])
+        self.json_format = config.get("log_format", "text") == "json"
+        self.max_bytes = int(config.get("log_max_kb", 1024)) * 1024
+        self.backups = max(1, int(config.get("log_backups", 5)))
+        self.max_age = int(config.get("log_max_age_days", 7)) * 86400
     
     def log(self, level: str, message: str):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] [{level}] {message}"
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry + "\n")
-        if level == "ERROR":
+        with self._lock:
+            self._write(level, message)
+    
+    def _write(self, level: str, message: str):
+        if self.LEVELS.get(level, 20) >= self.level:
+            now = datetime.now()
+            if self.json_format:
+                entry = json.dumps({"time": now.isoformat(timespec="seconds"), "level": level,
+                                    "pid": os.getpid(), "message": message}, ensure_ascii=False)
+            else:
+                entry = f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] [{level}] {message}"
+            self._buffer.append(entry)
+            if level == "ERROR" or len(self._buffer) >= self.BUFFER_SIZE:
+                self.flush()
+        if self.plain_stderr:
+            if level != "DEBUG":
+                print(f"{level.lower()}: {message}", file=sys.stderr)
+        elif level == "ERROR":
             print(f"{Colors.RED}❌ {message}{Colors.ENDC}")
         elif level == "WARNING":
             print(f"{Colors.YELLOW}⚠️  {message}{Colors.ENDC}")
@@ -66,33 +131,187 @@ class Logger:
             print(f"{Colors.CYAN}ℹ️  {message}{Colors.ENDC}")
         elif level == "SUCCESS":
             print(f"{Colors.GREEN}✅ {message}{Colors.ENDC}")
+    
+    def flush(self) -> None:
+        """Tampondaki kayıtları tek yazmada dosyaya aktar"""
+        with self._lock:
+            if not self._buffer:
+                return
+            lines, self._buffer[:] = "\n".join(self._buffer) + "\n", []
+            try:
+                if not self._checked:
+                    ALP_LOGS.mkdir(parents=True, exist_ok=True)
+                    self._rotate_if_needed()
+                    self._checked = True
+                f = open(self.log_file, 'a', encoding='utf-8')
+                if f.tell() and f.tell() + len(lines) > self.max_bytes:
+                    f.close()
+                    self._rotate()
+                    f = open(self.log_file, 'a', encoding='utf-8')
+                with f:
+                    f.write(lines)
+            except OSError:
+                pass
+    
+    def _rotate_if_needed(self) -> None:
+        """Dosya bugünden eskiyse ya da boyutu aşılmışsa süreç başında döndür"""
+        try:
+            st = self.log_file.stat()
+        except FileNotFoundError:
+            return
+        if st.st_size > self.max_bytes or datetime.fromtimestamp(st.st_mtime).date() != datetime.now().date():
+            self._rotate()
+    
+    def _rotate(self) -> None:
+        """alp.log -> alp.log.1 -> ... -> alp.log.N; eski ve fazla yedekleri sil"""
+        oldest = self.log_file.with_name(f"{self.log_file.name}.{self.backups}")
+        if oldest.exists():
+            oldest.unlink()
+        for i in range(self.backups - 1, 0, -1):
+            src = self.log_file.with_name(f"{self.log_file.name}.{i}")
+            if src.exists():
+                os.replace(src, self.log_file.with_name(f"{self.log_file.name}.{i + 1}"))
+        if self.log_file.exists():
+            os.replace(self.log_file, self.log_file.with_name(f"{self.log_file.name}.1"))
+        cutoff = time.time() - self.max_age
+        # Eski sürümlerin süreç başına açtığı alp_*.log dosyaları da yaşa göre temizlenir
+        for path in list(ALP_LOGS.glob(f"{self.log_file.name}.*")) + list(ALP_LOGS.glob("alp_*.log")):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
 
 logger = Logger()
 
+class StateStore:
+    """Yüklü paketler ve sertifikalar için SQLite (WAL) deposu.
+    
+    Her kayıt ada göre indekslenmiş bir satırda JSON olarak tutulur; bir
+    yazma yalnızca değişen satırlara dokunur. WAL kipinde okuyucular
+    yazıcıyı beklemez, eşzamanlı alp süreçleri busy_timeout ile sıraya girer.
+    İlk açılışta eski installed.json / certificates.json içeriği bir kez
+    aktarılır.
+    """
+    
+    TABLES = ("installed", "certificates")
+    
+    def __init__(self, path: Path = STATE_DB):
+        import sqlite3
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self._depth = 0
+        self._lock = threading.RLock()
+        with self.transaction():
+            for table in self.TABLES:
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (name TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._migrate_json()
+    
+    @contextlib.contextmanager
+    def transaction(self):
+        """İç içe kullanılabilen yazma işlemi; en dıştaki blok bir kez commit eder.
+        
+        Bağlantı iş parçacıkları arasında paylaşıldığından işlem boyunca kilit
+        tutulur; başka bir iş parçacığının işlemi açık olana kadar bekler.
+        """
+        with self._lock:
+            if self._depth == 0:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self.conn
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self.conn.execute("COMMIT")
+    
+    def _migrate_json(self) -> None:
+        """installed.json ve certificates.json'u tek seferlik içe aktar"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        if row:
+            return
+        with self.transaction():
+            for table, source in (("installed", INSTALLED_DB), ("certificates", CERTIFICATES_DB)):
+                if not source.exists():
+                    continue
+                try:
+                    with open(source, 'r') as f:
+                        records = json.load(f)
+                except (OSError, ValueError):
+                    logger.log("WARNING", f"{source.name} okunamadı, aktarılmadı")
+                    continue
+                for name, data in records.items():
+                    self.put(table, name, data)
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                              (datetime.now().isoformat(),))
+    
+    def load(self, table: str) -> Dict[str, Dict]:
+        return {name: json.loads(data) for name, data in
+                self.conn.execute(f"SELECT name, data FROM {table} ORDER BY name")}
+    
+    def put(self, table: str, name: str, data: Dict) -> None:
+        with self.transaction():
+            self.conn.execute(f"INSERT OR REPLACE INTO {table} (name, data) VALUES (?, ?)",
+                              (name, json.dumps(data, ensure_ascii=False)))
+    
+    def delete(self, table: str, name: str) -> None:
+        with self.transaction():
+            self.conn.execute(f"DELETE FROM {table} WHERE name = ?", (name,))
+    
+    def sync(self, table: str, records: Dict[str, Dict], names: Optional[List[str]] = None) -> None:
+        """Verilen adları (ya da tüm tabloyu) bellekteki kayıtlarla tek işlemde eşitle"""
+        with self.transaction():
+            if names is None:
+                stale = {row[0] for row in self.conn.execute(f"SELECT name FROM {table}")} - set(records)
+                names = list(records) + sorted(stale)
+            for name in names:
+                if name in records:
+                    self.put(table, name, records[name])
+                else:
+                    self.delete(table, name)
+    
+    def check(self) -> str:
+        return self.conn.execute("PRAGMA quick_check").fetchone()[0]
+    
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def set_meta(self, key: str, value: str) -> None:
+        with self.transaction():
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
 class CertificateManager:
     """Paket sertifika yönetim sistemi"""
     
-    def __init__(self):
+    def __init__(self, store: Optional[StateStore] = None):
+        self.store = store or StateStore()
         self.certificates = self.load_certificates()
     
     def load_certificates(self) -> Dict:
         """Sertifika veritabanını yükle"""
-        if CERTIFICATES_DB.exists():
-            try:
-                with open(CERTIFICATES_DB, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+        import sqlite3
+        try:
+            return self.store.load("certificates")
+        except (sqlite3.Error, ValueError):
+            return {}
     
-    def save_certificates(self):
-        """Sertifika veritabanını kaydet"""
-        CERTIFICATES_DB.parent.mkdir(parents=True, exist_ok=True)
-        with open(CERTIFICATES_DB, 'w') as f:
-            json.dump(self.certificates, f, indent=2, ensure_ascii=False)
+    def save_certificates(self, *names: str):
+        """Sertifika veritabanını kaydet (ad verilirse yalnızca o kayıtlar yazılır)"""
+        self.store.sync("certificates", self.certificates, list(names) if names else None)
     
     def generate_certificate(self, package_name: str, author: str, cert_type: str = "custom") -> Dict:
         """Yeni bir sertifika oluştur"""
+        import secrets
         cert_id = secrets.token_hex(16)
         timestamp = datetime.now().isoformat()
         
@@ -137,7 +356,7 @@ class CertificateManager:
     def register_certificate(self, package_name: str, cert_data: Dict):
         """Sertifikayı kaydet"""
         self.certificates[package_name] = cert_data
-        self.save_certificates()
+        self.save_certificates(package_name)
     
     def get_certificate(self, package_name: str) -> Optional[Dict]:
         """Paket sertifikasını getir"""
@@ -177,6 +396,7 @@ class CertificateManager:
 
     def generate_alpc_file(self, package_name: str, author: str, cert_type: str) -> Dict:
         """cerf.alpc içeriğini üret (official/dev/normal)"""
+        import secrets
         ts = datetime.now().isoformat()
         token = secrets.token_hex(16)
         cert_type = cert_type.lower()
@@ -233,8 +453,26 @@ class Config:
         "cache_size": 1000,
         "verify_packages": True,
         "parallel_install": False,
+        "install_workers": 4,
         "check_dependencies": True,
-        "keep_cache": False
+        "keep_cache": False,
+        "refresh_workers": 8,
+        "http_timeout": 30,
+        "http_pool_size": 8,
+        "http_cache": True,
+        "http_cache_max_age": 604800,
+        "http_cache_max_entry_kb": 2048,
+        "http_cache_max_mb": 50,
+        "negative_cache_ttl": 21600,
+        "mirror_url": None,
+        "repo_index": True,
+        "repo_index_url": None,
+        "doctor_workers": 8,
+        "log_level": "INFO",
+        "log_format": "text",
+        "log_max_kb": 1024,
+        "log_backups": 5,
+        "log_max_age_days": 7
     }
     
     def __init__(self):
@@ -244,7 +482,8 @@ class Config:
         if CONFIG_FILE.exists():
             try:
                 with open(CONFIG_FILE, 'r') as f:
-                    return json.load(f)
+                    # Eski config dosyalarında olmayan yeni anahtarlar varsayılanlardan gelir
+                    return {**self.DEFAULT_CONFIG, **json.load(f)}
             except:
                 return self.DEFAULT_CONFIG.copy()
         return self.DEFAULT_CONFIG.copy()
@@ -261,74 +500,1826 @@ class Config:
         self.config[key] = value
         self.save()
 
+class RecordWriter:
+    """Sorgu komutları için makine okunur çıktı.
+    
+    "json" kipinde kayıtlar tek bir JSON dizisi olarak, "ndjson" kipinde
+    satır başına bir kayıt olarak üretildikçe stdout'a yazılır; renk ve
+    emoji içermez.
+    """
+    
+    MODES = ("json", "ndjson")
+    
+    def __init__(self, mode: str, stream=None):
+        self.mode = mode
+        self.stream = stream or sys.stdout
+    
+    def _dump(self, record: Dict) -> str:
+        return json.dumps(record, ensure_ascii=False, default=str)
+    
+    def records(self, records) -> int:
+        """Kayıtları akış halinde yaz; yazılan kayıt sayısını döndür"""
+        count = 0
+        if self.mode == "json":
+            self.stream.write("[")
+        for record in records:
+            if self.mode == "json":
+                self.stream.write(("," if count else "") + "\n  " + self._dump(record))
+            else:
+                self.stream.write(self._dump(record) + "\n")
+            count += 1
+        if self.mode == "json":
+            self.stream.write("\n]\n" if count else "]\n")
+        self.stream.flush()
+        return count
+    
+    def record(self, record: Dict) -> None:
+        """Tek nesne yaz (info, stats gibi komutlar için)"""
+        self.stream.write(self._dump(record) + "\n")
+        self.stream.flush()
+
+class HttpResponse:
+    """Havuzdan alınmış bağlantı üzerindeki yanıt; kapatılınca bağlantı havuza döner"""
+    
+    def __init__(self, client: "HttpClient", key: Tuple, conn, raw, url: str):
+        self._client = client
+        self._key = key
+        self._conn = conn
+        self._raw = raw
+        self.url = url
+        self.status = raw.status
+        self.headers = raw.headers
+    
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._raw.read(amt)
+    
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        # Gövde tamamen okunmadıysa bağlantı yeniden kullanılamaz
+        if self._raw.isclosed() and not self._raw.will_close:
+            self._client._release(self._key, self._conn)
+        else:
+            self._raw.close()
+            self._conn.close()
+        self._conn = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+class FileResponse:
+    """file:// URL'leri için HttpResponse arayüzlü yanıt (yerel ayna desteği).
+    
+    Dosya yoksa 404 döner. ETag dosyanın mtime ve boyutundan üretilir;
+    If-None-Match eşleşirse 304 döner, böylece koşullu istekler yerel
+    aynada da yalnızca bir stat çağrısına mal olur.
+    """
+    
+    def __init__(self, url: str, headers: Dict[str, str]):
+        import urllib.parse
+        import urllib.request
+        self.url = url
+        self.headers: Dict[str, str] = {}
+        self._file = None
+        path = urllib.request.url2pathname(urllib.parse.urlsplit(url).path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        if st is None or not os.path.isfile(path):
+            self.status = 404
+            return
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        self.headers['ETag'] = etag
+        if headers.get('If-None-Match') == etag:
+            self.status = 304
+            return
+        self._file = open(path, 'rb')
+        self.status = 200
+        self.headers['Content-Length'] = str(st.st_size)
+    
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._file.read(amt) if self._file else b''
+    
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+class HttpClient:
+    """Tüm ağ trafiği için ortak HTTP istemcisi.
+    
+    Host başına kalıcı (keep-alive) bağlantı havuzu tutar; böylece aynı
+    sunucuya yapılan ardışık isteklerde TCP+TLS el sıkışması tekrarlanmaz.
+    Zaman aşımı, User-Agent, gzip desteği, yönlendirmeler ve ortam
+    değişkenlerindeki proxy ayarları burada tek noktadan yönetilir.
+    """
+    MAX_REDIRECTS = 5
+    
+    def __init__(self, timeout: int = 30, pool_size: int = 8, user_agent: str = USER_AGENT):
+        import urllib.request
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.user_agent = user_agent
+        self._pools: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+        self._proxies = urllib.request.getproxies()
+    
+    def _proxy_for(self, scheme: str, host: str) -> Optional["urllib.parse.SplitResult"]:
+        import urllib.parse
+        import urllib.request
+        proxy = self._proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        if '://' not in proxy:
+            proxy = f"http://{proxy}"
+        return urllib.parse.urlsplit(proxy)
+    
+    def _connect(self, scheme: str, host: str, port: int):
+        import http.client
+        proxy = self._proxy_for(scheme, host)
+        if scheme == 'https':
+            if proxy:
+                conn = http.client.HTTPSConnection(proxy.hostname, proxy.port or 8080, timeout=self.timeout)
+                conn.set_tunnel(host, port)
+                return conn
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        if proxy:
+            return http.client.HTTPConnection(proxy.hostname, proxy.port or 8080, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+    
+    def _checkout(self, key: Tuple) -> Tuple[object, bool]:
+        with self._lock:
+            idle = self._pools.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(*key), False
+    
+    def _release(self, key: Tuple, conn) -> None:
+        with self._lock:
+            idle = self._pools.setdefault(key, [])
+            if len(idle) < self.pool_size:
+                idle.append(conn)
+                return
+        conn.close()
+    
+    def close(self) -> None:
+        """Havuzdaki tüm boştaki bağlantıları kapat"""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for idle in pools.values():
+            for conn in idle:
+                conn.close()
+    
+    def _send(self, method: str, url: str, headers: Dict[str, str], timeout: Optional[float]) -> HttpResponse:
+        import http.client
+        import urllib.parse
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https'):
+            raise ValueError(f"Desteklenmeyen URL şeması: {url}")
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        request_headers = {'User-Agent': self.user_agent, 'Connection': 'keep-alive', **headers}
+        if scheme == 'http' and self._proxy_for(scheme, parts.hostname):
+            # Düz HTTP proxy'leri mutlak URL bekler
+            request_headers.setdefault('Host', parts.netloc)
+            target = url
+        
+        for attempt in range(2):
+            conn, reused = self._checkout(key)
+            conn.timeout = timeout or self.timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(conn.timeout)
+            try:
+                conn.request(method, target, headers=request_headers)
+                raw = conn.getresponse()
+            except (ConnectionError, http.client.BadStatusLine):
+                conn.close()
+                # Sunucu boştaki keep-alive bağlantıyı kapatmış olabilir; bir kez yeniden dene
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            return HttpResponse(self, key, conn, raw, url)
+        raise http.client.HTTPException(f"Bağlantı kurulamadı: {url}")
+    
+    def open(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+             timeout: Optional[float] = None) -> HttpResponse:
+        """İstek gönder ve yönlendirmeleri izleyerek akış halinde okunabilir yanıt döndür"""
+        import http.client
+        import urllib.parse
+        headers = dict(headers or {})
+        if url.startswith('file:'):
+            return FileResponse(url, headers)
+        for _ in range(self.MAX_REDIRECTS + 1):
+            resp = self._send(method, url, headers, timeout)
+            location = resp.headers.get('Location')
+            if resp.status in (301, 302, 303, 307, 308) and location:
+                resp.read()
+                resp.close()
+                url = urllib.parse.urljoin(url, location)
+                if resp.status == 303:
+                    method = 'GET'
+                continue
+            return resp
+        raise http.client.HTTPException(f"Çok fazla yönlendirme: {url}")
+    
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None) -> Tuple[int, "http.client.HTTPMessage", bytes]:
+        """İsteği tamamla; (durum, başlıklar, gzip'i açılmış gövde) döndür"""
+        import gzip
+        headers = {'Accept-Encoding': 'gzip', **(headers or {})}
+        with self.open(method, url, headers, timeout) as resp:
+            body = resp.read()
+        if resp.headers.get('Content-Encoding', '').lower() == 'gzip':
+            body = gzip.decompress(body)
+        return resp.status, resp.headers, body
+
+class HttpCache:
+    """ETag/Last-Modified tabanlı kalıcı HTTP yanıt cache'i.
+    
+    Her URL için iki dosya tutulur: <sha256(url)>.json (başlıklar ve zaman
+    bilgisi) ve <sha256(url)>.body (yanıt gövdesi). Girdiler son doğrulamadan
+    bu yana http_cache_max_age saniye geçince silinir; toplam boyut
+    http_cache_max_mb sınırını aşarsa en eski girdiler atılır.
+    """
+    
+    def __init__(self, config: "Config"):
+        self.enabled = bool(config.get("http_cache", True))
+        self.max_age = int(config.get("http_cache_max_age", 604800))
+        self.max_entry_bytes = int(config.get("http_cache_max_entry_kb", 2048)) * 1024
+        self.max_total_bytes = int(config.get("http_cache_max_mb", 50)) * 1024 * 1024
+    
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return HTTP_CACHE_DIR / f"{key}.json", HTTP_CACHE_DIR / f"{key}.body"
+    
+    def _write_atomic(self, path: Path, data: bytes):
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Geçerli bir cache girdisi varsa meta bilgisini döndür"""
+        if not self.enabled:
+            return None
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - meta.get("validated_at", 0) > self.max_age or not body_path.exists():
+            self.discard(url)
+            return None
+        return meta
+    
+    def conditional_headers(self, meta: Optional[Dict]) -> Dict[str, str]:
+        """Cache girdisine göre If-None-Match / If-Modified-Since başlıkları"""
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers['If-None-Match'] = meta["etag"]
+            if meta.get("last_modified"):
+                headers['If-Modified-Since'] = meta["last_modified"]
+        return headers
+    
+    def store(self, url: str, body: bytes, headers) -> None:
+        """200 yanıtını doğrulayıcı başlıklarıyla birlikte kaydet"""
+        if not self.enabled:
+            return
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified) or len(body) > self.max_entry_bytes:
+            return
+        meta_path, body_path = self._paths(url)
+        now = time.time()
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": len(body),
+            "stored_at": now,
+            "validated_at": now,
+        }
+        try:
+            HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(body_path, body)
+            self._write_atomic(meta_path, json.dumps(meta).encode())
+        except OSError as e:
+            logger.log("WARNING", f"HTTP cache yazılamadı: {e}")
+    
+    def revalidated(self, url: str, meta: Dict) -> Optional[bytes]:
+        """304 yanıtından sonra cache'teki gövdeyi döndür ve doğrulama zamanını yenile"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            meta["validated_at"] = time.time()
+            self._write_atomic(meta_path, json.dumps(meta).encode())
+            return body
+        except OSError:
+            self.discard(url)
+            return None
+    
+    def discard(self, url: str) -> None:
+        for path in self._paths(url):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    
+    def prune(self) -> int:
+        """Süresi dolan girdileri sil ve toplam boyutu sınırın altına indir"""
+        if not HTTP_CACHE_DIR.exists():
+            return 0
+        entries = []
+        removed = 0
+        now = time.time()
+        for meta_path in HTTP_CACHE_DIR.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                with open(meta_path, 'r') as f:
+                    meta = json.load(f)
+                size = body_path.stat().st_size
+            except (OSError, ValueError):
+                meta, size = None, 0
+            if meta is None or now - meta.get("validated_at", 0) > self.max_age:
+                for path in (meta_path, body_path):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                removed += 1
+                continue
+            entries.append((meta.get("validated_at", 0), size, meta_path, body_path))
+        
+        total = sum(e[1] for e in entries)
+        for _, size, meta_path, body_path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_total_bytes:
+                break
+            for path in (meta_path, body_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        return removed
+
+class NegativeCache:
+    """404 dönen ham dosya URL'leri için süreli negatif cache.
+    
+    cerf.alpc içermeyen ya da yalnızca master dalı olan repolarda her
+    güncellemede aynı 404 isteğinin tekrarlanmasını önler.
+    """
+    
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = False
+    
+    def _load(self) -> Dict[str, float]:
+        if self._entries is None:
+            try:
+                with open(NEGATIVE_CACHE_FILE, 'r') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+    
+    def contains(self, url: str) -> bool:
+        with self._lock:
+            missed_at = self._load().get(url)
+            return missed_at is not None and time.time() - missed_at < self.ttl
+    
+    def add(self, url: str) -> None:
+        with self._lock:
+            self._load()[url] = time.time()
+            self._dirty = True
+    
+    def discard(self, url: str) -> None:
+        with self._lock:
+            if self._load().pop(url, None) is not None:
+                self._dirty = True
+    
+    def save(self) -> None:
+        """Süresi dolmuş kayıtları atıp diske yaz"""
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            entries = {u: t for u, t in self._load().items() if now - t < self.ttl}
+            try:
+                NEGATIVE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                with open(NEGATIVE_CACHE_FILE, 'w') as f:
+                    json.dump(entries, f)
+                self._entries = entries
+                self._dirty = False
+            except OSError as e:
+                logger.log("WARNING", f"Negatif cache yazılamadı: {e}")
+
+class CacheManager:
+    """ALP_CACHE için boyut sınırlı LRU yönetimi.
+    
+    Girdiler ALP_CACHE'in doğrudan çocuklarıdır (indirilen dosyalar,
+    install_* hazırlık dizinleri); nesne deposunda her nesne, HTTP
+    cache'inde ise her URL'nin .json ve .body dosyaları tek girdi sayılır. Son erişim zamanı ve boyut
+    access.json'da tutulur. Toplam cache_size (MB) sınırını aşınca en uzun
+    süredir kullanılmayan girdiler silinir; kullanımda olduğu için
+    iğnelenen ya da son GRACE saniyede değişen girdiler atlanır.
+    keep_cache açıksa otomatik silme yapılmaz.
+    """
+    
+    GRACE = 60
+    LOW_WATERMARK = 0.9
+    BOOKKEEPING = {CACHE_ACCESS_FILE.name, NEGATIVE_CACHE_FILE.name, OBJECT_REFS_FILE.name}
+    SUBDIRS = {HTTP_CACHE_DIR.name, OBJECTS_DIR.name}
+    
+    def __init__(self, config: "Config"):
+        self.max_bytes = int(config.get("cache_size", 1000)) * 1024 * 1024
+        self.keep = bool(config.get("keep_cache", False))
+        self._lock = threading.RLock()
+        self._entries = None
+        self._dirty = False
+        self._pins: Dict[str, int] = {}
+        atexit.register(self.save)
+    
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            try:
+                with open(CACHE_ACCESS_FILE, 'r') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+    
+    @staticmethod
+    def key(path: Path) -> Optional[str]:
+        """Yolun ait olduğu cache girdisinin anahtarı (cache dışındaysa None)"""
+        try:
+            rel = Path(path).resolve().relative_to(ALP_CACHE.resolve())
+        except (ValueError, OSError):
+            return None
+        parts = rel.parts
+        if not parts:
+            return None
+        if parts[0] == HTTP_CACHE_DIR.name and len(parts) > 1:
+            return f"{parts[0]}/{parts[1].split('.')[0]}"
+        if parts[0] == OBJECTS_DIR.name and len(parts) > 1:
+            return f"{parts[0]}/{parts[1]}"
+        return parts[0]
+    
+    @staticmethod
+    def _paths(key: str) -> List[Path]:
+        if key.startswith(f"{HTTP_CACHE_DIR.name}/"):
+            stem = key.split('/', 1)[1]
+            return [HTTP_CACHE_DIR / f"{stem}.json", HTTP_CACHE_DIR / f"{stem}.body"]
+        if key.startswith(f"{OBJECTS_DIR.name}/"):
+            return [OBJECTS_DIR / key.split('/', 1)[1]]
+        return [ALP_CACHE / key]
+    
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            st = path.lstat()
+        except OSError:
+            return 0
+        if not path.is_dir():
+            return st.st_size
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+        return total
+    
+    def touch(self, path: Path) -> None:
+        """Girdinin erişim zamanını ve boyutunu güncelle"""
+        key = self.key(path)
+        if key is None:
+            return
+        size = sum(self._size(p) for p in self._paths(key))
+        with self._lock:
+            self._load()[key] = {"atime": time.time(), "size": size}
+            self._dirty = True
+    
+    def acquire(self, path: Path) -> None:
+        """Girdiyi release çağrılana kadar silinmeye karşı iğnele"""
+        key = self.key(path)
+        if key:
+            with self._lock:
+                self._pins[key] = self._pins.get(key, 0) + 1
+    
+    def release(self, path: Path) -> None:
+        key = self.key(path)
+        if key and key in self._pins:
+            self.touch(path)
+            with self._lock:
+                self._pins[key] -= 1
+                if not self._pins[key]:
+                    del self._pins[key]
+    
+    @contextlib.contextmanager
+    def pin(self, path: Path):
+        """Blok süresince girdinin silinmesini engelle"""
+        self.acquire(path)
+        try:
+            yield
+        finally:
+            self.release(path)
+    
+    def _scan(self) -> Dict[str, Dict]:
+        """Diskteki girdileri kayıtla eşleştir; kayıtsız girdiler mtime ve ölçülen boyutla eklenir"""
+        entries = self._load()
+        found = {}
+        for directory, prefix in ((ALP_CACHE, ""), (HTTP_CACHE_DIR, f"{HTTP_CACHE_DIR.name}/"),
+                                  (OBJECTS_DIR, f"{OBJECTS_DIR.name}/")):
+            try:
+                listing = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in listing:
+                if directory == ALP_CACHE and (entry.name in self.BOOKKEEPING or entry.name in self.SUBDIRS):
+                    continue
+                if entry.name.endswith('.tmp'):
+                    continue
+                key = prefix + (entry.name.split('.')[0] if directory == HTTP_CACHE_DIR else entry.name)
+                if key in found:
+                    continue
+                known = entries.get(key)
+                if known is None:
+                    try:
+                        mtime = entry.stat(follow_symlinks=False).st_mtime
+                    except OSError:
+                        continue
+                    known = {"atime": mtime, "size": sum(self._size(p) for p in self._paths(key))}
+                    entries[key] = known
+                    self._dirty = True
+                found[key] = known
+        for key in set(entries) - set(found):
+            del entries[key]
+            self._dirty = True
+        return found
+    
+    def usage(self) -> int:
+        with self._lock:
+            return sum(e.get("size", 0) for e in self._scan().values())
+    
+    def enforce(self, force: bool = False) -> int:
+        """Toplam boyut sınırı aştıysa LRU sırasıyla sil; silinen girdi sayısını döndür"""
+        import shutil
+        if self.keep and not force:
+            return 0
+        with self._lock:
+            entries = self._scan()
+            total = sum(e.get("size", 0) for e in entries.values())
+            if total <= self.max_bytes:
+                return 0
+            target = self.max_bytes * self.LOW_WATERMARK
+            now = time.time()
+            removed = 0
+            for key, entry in sorted(entries.items(), key=lambda item: item[1].get("atime", 0)):
+                if total <= target:
+                    break
+                if key in self._pins:
+                    continue
+                paths = self._paths(key)
+                try:
+                    if any(now - p.lstat().st_mtime < self.GRACE for p in paths if p.exists()):
+                        continue
+                except OSError:
+                    pass
+                for p in paths:
+                    if p.is_dir() and not p.is_symlink():
+                        shutil.rmtree(p, ignore_errors=True)
+                    else:
+                        try:
+                            p.unlink()
+                        except OSError:
+                            pass
+                total -= entry.get("size", 0)
+                del self._entries[key]
+                self._dirty = True
+                removed += 1
+            if removed:
+                logger.log("DEBUG", f"Cache LRU: {removed} girdi silindi, kalan {total / 1024 / 1024:.1f} MB")
+            return removed
+    
+    def reset(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._dirty = False
+    
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                ALP_CACHE.mkdir(parents=True, exist_ok=True)
+                tmp = CACHE_ACCESS_FILE.with_name(f"{CACHE_ACCESS_FILE.name}.{os.getpid()}.tmp")
+                with open(tmp, 'w') as f:
+                    json.dump(self._entries, f)
+                os.replace(tmp, CACHE_ACCESS_FILE)
+                self._dirty = False
+            except OSError as e:
+                logger.log("WARNING", f"Cache erişim kaydı yazılamadı: {e}")
+
+class ObjectStore:
+    """İçerik adresli artifact deposu (cache/objects/<sha256>).
+    
+    Her nesne içeriğinin SHA-256 özetiyle adlandırılır ve bir kez saklanır;
+    aynı baytlar farklı adlar altında indirilse de tek kopya tutulur.
+    refs.json ad → özet eşlemesini, kaynak URL'yi ve sunucu doğrulayıcılarını
+    (ETag/Last-Modified) tutar; böylece bilinen bir adın güncel olduğu
+    koşullu istekle, gövde indirilmeden doğrulanabilir.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refs = None
+        self._dirty = False
+        atexit.register(self.save)
+    
+    def _load(self) -> Dict[str, Dict]:
+        if self._refs is None:
+            try:
+                with open(OBJECT_REFS_FILE, 'r') as f:
+                    self._refs = json.load(f)
+            except (OSError, ValueError):
+                self._refs = {}
+        return self._refs
+    
+    @staticmethod
+    def path(digest: str) -> Path:
+        return OBJECTS_DIR / digest
+    
+    def ref(self, name: str) -> Optional[Dict]:
+        """Adın kaydını döndür; işaret ettiği nesne silinmişse None"""
+        with self._lock:
+            ref = self._load().get(name)
+        if ref and self.path(ref["sha256"]).is_file():
+            return ref
+        return None
+    
+    def set_ref(self, name: str, digest: str, url: str, headers) -> None:
+        """Adı özete bağla; yanıt başlıklarındaki doğrulayıcıları sakla.
+        
+        304 yanıtı doğrulayıcıların bir kısmını göndermeyebilir; eksikler
+        aynı içeriğe ait önceki kayıttan alınır.
+        """
+        with self._lock:
+            old = self._load().get(name) or {}
+            if old.get("sha256") != digest or old.get("url") != url:
+                old = {}
+            self._refs[name] = {
+                "sha256": digest,
+                "url": url,
+                "etag": headers.get("ETag") or old.get("etag"),
+                "last_modified": headers.get("Last-Modified") or old.get("last_modified"),
+                "validated_at": time.time(),
+            }
+            self._dirty = True
+    
+    def conditional_headers(self, name: str, url: str) -> Dict[str, str]:
+        """Ad aynı URL'den alınmışsa If-None-Match / If-Modified-Since başlıkları"""
+        ref = self.ref(name)
+        headers = {}
+        if ref and ref.get("url") == url:
+            if ref.get("etag"):
+                headers['If-None-Match'] = ref["etag"]
+            if ref.get("last_modified"):
+                headers['If-Modified-Since'] = ref["last_modified"]
+        return headers
+    
+    def add(self, tmp_path: Path, digest: str) -> Tuple[Path, bool]:
+        """Geçici dosyayı nesne olarak yerleştir; (nesne yolu, yeni mi) döndür.
+        
+        Aynı özetli nesne zaten varsa geçici dosya silinir (tekilleştirme).
+        """
+        target = self.path(digest)
+        if target.is_file():
+            tmp_path.unlink(missing_ok=True)
+            return target, False
+        os.chmod(tmp_path, 0o755)
+        os.replace(tmp_path, target)
+        return target, True
+    
+    def referenced(self) -> set:
+        with self._lock:
+            return {ref["sha256"] for ref in self._load().values()}
+    
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._load())
+    
+    def drop(self, name: str) -> None:
+        with self._lock:
+            if self._load().pop(name, None) is not None:
+                self._dirty = True
+    
+    def reset(self) -> None:
+        with self._lock:
+            self._refs = {}
+            self._dirty = False
+    
+    def save(self) -> None:
+        """Nesnesi silinmiş adları atıp diske yaz"""
+        with self._lock:
+            if not self._dirty:
+                return
+            refs = {n: r for n, r in self._load().items() if self.path(r["sha256"]).is_file()}
+            try:
+                ALP_CACHE.mkdir(parents=True, exist_ok=True)
+                tmp = OBJECT_REFS_FILE.with_name(f"{OBJECT_REFS_FILE.name}.{os.getpid()}.tmp")
+                with open(tmp, 'w') as f:
+                    json.dump(refs, f)
+                os.replace(tmp, OBJECT_REFS_FILE)
+                self._refs = refs
+                self._dirty = False
+            except OSError as e:
+                logger.log("WARNING", f"Nesne deposu kayıtları yazılamadı: {e}")
+
+class ChecksumCache:
+    """Dosya SHA-256 özetleri için kalıcı cache.
+    
+    Özetler (yol, boyut, mtime_ns, inode) anahtarıyla digests.json içinde
+    tutulur; dosya değişmediyse tekrar doğrulama yalnızca bir stat çağrısına
+    mal olur. Dosyalar sabit boyutlu parçalarla, büyük dosyalar ise mmap ile
+    okunur; hiçbir durumda dosyanın tamamı belleğe alınmaz.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = False
+        atexit.register(self.save)
+    
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            try:
+                with open(DIGEST_CACHE_FILE, 'r') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+    
+    @staticmethod
+    def _signature(st: os.stat_result) -> Dict:
+        return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino}
+    
+    @staticmethod
+    def hash_file(filepath: Path, size: Optional[int] = None) -> str:
+        """Dosyayı parça parça (büyük dosyalarda mmap ile) okuyarak SHA-256 hesapla"""
+        sha256 = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            if size is None:
+                size = os.fstat(f.fileno()).st_size
+            if size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    sha256.update(mm)
+            else:
+                buf = bytearray(CHUNK_SIZE)
+                view = memoryview(buf)
+                while True:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    sha256.update(view[:n])
+        return sha256.hexdigest()
+    
+    def checksum(self, filepath: Path) -> str:
+        """Dosya değişmediyse cache'teki özeti, değiştiyse yeniden hesaplananı döndür"""
+        key = str(Path(filepath).resolve())
+        st = os.stat(key)
+        signature = self._signature(st)
+        with self._lock:
+            entry = self._load().get(key)
+        if entry and all(entry.get(k) == v for k, v in signature.items()):
+            return entry["sha256"]
+        digest = self.hash_file(Path(key), st.st_size)
+        with self._lock:
+            self._load()[key] = {**signature, "sha256": digest}
+            self._dirty = True
+        return digest
+    
+    def record(self, filepath: Path, digest: str) -> None:
+        """Başka bir yoldan (ör. indirme sırasında) hesaplanmış özeti kaydet"""
+        key = str(Path(filepath).resolve())
+        try:
+            signature = self._signature(os.stat(key))
+        except OSError:
+            return
+        with self._lock:
+            self._load()[key] = {**signature, "sha256": digest}
+            self._dirty = True
+    
+    def save(self) -> None:
+        """Artık var olmayan dosyaların kayıtlarını atıp diske yaz"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = {k: v for k, v in self._load().items() if os.path.exists(k)}
+            try:
+                DIGEST_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                tmp = DIGEST_CACHE_FILE.with_name(f"{DIGEST_CACHE_FILE.name}.{os.getpid()}.tmp")
+                with open(tmp, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(tmp, DIGEST_CACHE_FILE)
+                self._entries = entries
+                self._dirty = False
+            except OSError as e:
+                logger.log("WARNING", f"Özet cache'i yazılamadı: {e}")
+
+class ReverseDependencyIndex:
+    """Yüklü paketler için kalıcı ters bağımlılık indeksi.
+    
+    revdeps.json içinde {bağımlılık: [ona bağlı yüklü paketler]} tutulur;
+    "X'e kim bağlı?" sorusu tüm kaydı taramadan tek sözlük erişimiyle
+    yanıtlanır. Kurulum, kaldırma ve katalog güncellemesinde güncellenir.
+    """
+    
+    def __init__(self):
+        self.index: Dict[str, List[str]] = {}
+        self.loaded = False
+        if REVDEPS_DB.exists():
+            try:
+                with open(REVDEPS_DB, 'r') as f:
+                    self.index = json.load(f)
+                self.loaded = True
+            except (OSError, ValueError):
+                self.index = {}
+    
+    def dependents(self, package_name: str) -> List[str]:
+        return list(self.index.get(package_name, []))
+    
+    def add(self, package_name: str, deps: List[str]) -> None:
+        for dep in deps:
+            users = self.index.setdefault(dep, [])
+            if package_name not in users:
+                users.append(package_name)
+                users.sort()
+    
+    def discard(self, package_name: str) -> None:
+        """Paketi tüm bağımlılıklarının kullanıcı listesinden çıkar"""
+        for dep in list(self.index):
+            users = self.index[dep]
+            if package_name in users:
+                users.remove(package_name)
+                if not users:
+                    del self.index[dep]
+    
+    def rebuild(self, installed: Dict[str, Dict], packages: Dict[str, Dict]) -> None:
+        """İndeksi yüklü kayıtlardan (ve katalogdaki güncel bağımlılıklardan) yeniden kur"""
+        self.index = {}
+        for name, info in installed.items():
+            deps = set(info.get('dependencies', [])) | set(packages.get(name, {}).get('dependencies', []))
+            self.add(name, sorted(d for d in deps if d != name))
+    
+    def save(self) -> None:
+        REVDEPS_DB.parent.mkdir(parents=True, exist_ok=True)
+        with open(REVDEPS_DB, 'w') as f:
+            json.dump(self.index, f, indent=2, ensure_ascii=False)
+
+class SearchIndex:
+    """packages.json yanında tutulan kalıcı arama indeksi.
+    
+    Her alan belirteçlere ayrılıp terim -> [(belge, ağırlık)] ters listesine
+    yazılır; author/category/license değerleri ayrıca "alan:belirteç"
+    terimleri olarak filtrelenebilir. Sözlükteki terimler için tutulan
+    trigram indeksi ve sıralı sözlük sayesinde önek, alt dize ve yazım
+    hatalı sorgular tüm kataloğu taramadan eşleşir.
+    """
+    
+    VERSION = 1
+    FIELD_WEIGHTS = {"name": 8.0, "author": 2.0, "category": 2.0, "description": 1.0,
+                     "dependencies": 1.0, "license": 1.0}
+    FILTER_FIELDS = ("author", "category", "license")
+    TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+    
+    def __init__(self, data: Optional[Dict] = None):
+        data = data or {}
+        self.source = data.get("source")
+        self.docs: List[List[str]] = data.get("docs", [])
+        self.postings: Dict[str, List[List]] = data.get("postings", {})
+        self.trigrams: Dict[str, List[str]] = data.get("trigrams", {})
+        self.vocab: List[str] = data.get("vocab", [])
+        self.filter_vocab: List[str] = data.get("filter_vocab", [])
+    
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        return cls.TOKEN_RE.findall(str(text).casefold())
+    
+    @staticmethod
+    def grams(term: str, padded: bool = False) -> set:
+        if padded:
+            term = f" {term} "
+        return {term[i:i + 3] for i in range(len(term) - 2)}
+    
+    @staticmethod
+    def source_stamp() -> Optional[List[int]]:
+        try:
+            st = PACKAGES_DB.stat()
+        except FileNotFoundError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+    
+    @classmethod
+    def build(cls, packages: Dict[str, Dict]) -> "SearchIndex":
+        index = cls()
+        postings: Dict[str, Dict[int, float]] = {}
+        for doc_id, (name, pkg) in enumerate(sorted(packages.items())):
+            index.docs.append([name, str(pkg.get('version', '?')), str(pkg.get('description', ''))[:60]])
+            fields = {
+                "name": [name, *cls.tokenize(name)],
+                "author": cls.tokenize(pkg.get('author', '')),
+                "category": cls.tokenize(pkg.get('category', '')),
+                "description": cls.tokenize(pkg.get('description', '')),
+                "dependencies": [t for dep in pkg.get('dependencies', []) for t in cls.tokenize(dep)],
+                "license": cls.tokenize(pkg.get('license', '')),
+            }
+            for field, tokens in fields.items():
+                for token in tokens:
+                    terms = [token.casefold()]
+                    if field in cls.FILTER_FIELDS:
+                        terms.append(f"{field}:{token}")
+                    for term in terms:
+                        bucket = postings.setdefault(term, {})
+                        bucket[doc_id] = bucket.get(doc_id, 0.0) + cls.FIELD_WEIGHTS[field]
+        index.postings = {term: sorted([d, round(w, 2)] for d, w in bucket.items())
+                          for term, bucket in postings.items()}
+        index.vocab = sorted(t for t in postings if ':' not in t)
+        index.filter_vocab = sorted(t for t in postings if ':' in t)
+        trigrams: Dict[str, List[str]] = {}
+        for term in index.vocab:
+            for gram in cls.grams(term, padded=True):
+                trigrams.setdefault(gram, []).append(term)
+        index.trigrams = trigrams
+        return index
+    
+    @classmethod
+    def load(cls) -> Optional["SearchIndex"]:
+        """Diskteki indeksi yükle; packages.json değişmişse None döndür"""
+        try:
+            with open(SEARCH_INDEX_DB, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != cls.VERSION or data.get("source") != cls.source_stamp():
+            return None
+        return cls(data)
+    
+    def save(self) -> None:
+        self.source = self.source_stamp()
+        tmp = SEARCH_INDEX_DB.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({"version": self.VERSION, "source": self.source, "docs": self.docs,
+                       "postings": self.postings, "trigrams": self.trigrams, "vocab": self.vocab,
+                       "filter_vocab": self.filter_vocab},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp, SEARCH_INDEX_DB)
+    
+    @staticmethod
+    def _distance(a: str, b: str, limit: int) -> int:
+        """Yer değiştirmeyi tek hata sayan sınırlı düzenleme uzaklığı (limit aşılınca limit + 1)"""
+        if abs(len(a) - len(b)) > limit:
+            return limit + 1
+        before, prev = None, list(range(len(b) + 1))
+        for i, ca in enumerate(a, 1):
+            cur = [i]
+            for j, cb in enumerate(b, 1):
+                cost = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+                if before and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                    cost = min(cost, before[j - 2] + 1)
+                cur.append(cost)
+            if min(cur) > limit:
+                return limit + 1
+            before, prev = prev, cur
+        return prev[-1]
+    
+    @staticmethod
+    def _prefixed(vocab: List[str], prefix: str) -> List[str]:
+        import bisect
+        pos = bisect.bisect_left(vocab, prefix)
+        end = pos
+        while end < len(vocab) and vocab[end].startswith(prefix):
+            end += 1
+        return vocab[pos:end]
+    
+    def expand(self, token: str) -> Dict[str, float]:
+        """Sorgu belirtecini sözlükteki terimlere eşle: tam 1.0, önek 0.7, alt dize 0.6, yazım hatası 0.5"""
+        matches: Dict[str, float] = {}
+        if token in self.postings:
+            matches[token] = 1.0
+        for term in self._prefixed(self.vocab, token):
+            matches.setdefault(term, 0.7)
+        inner = self.grams(token)
+        if not inner:
+            return matches
+        shared: Dict[str, int] = {}
+        for gram in self.grams(token, padded=True):
+            for term in self.trigrams.get(gram, []):
+                shared[term] = shared.get(term, 0) + 1
+        for term in shared:
+            if term not in matches and inner <= self.grams(term):
+                matches[term] = 0.6
+        if len(token) < 4:
+            return matches
+        # Yazım hatası: en çok trigram paylaşan adaylar sınırlı uzaklıkla denetlenir
+        limit = 1 if len(token) < 8 else 2
+        candidates = sorted((t for t in shared if t not in matches), key=lambda t: -shared[t])
+        for term in candidates[:200]:
+            if self._distance(token, term, limit) <= limit:
+                matches[term] = 0.5
+        return matches
+    
+    def search(self, query: str) -> List[Tuple[float, List[str]]]:
+        """Sıralı sonuçlar: [(skor, [ad, sürüm, açıklama])]; tüm terimler ve filtreler sağlanmalı"""
+        import math
+        scores: Optional[Dict[int, float]] = None
+        total = max(1, len(self.docs))
+        for part in query.split():
+            field, sep, value = part.partition(':')
+            if sep and field.casefold() in self.FILTER_FIELDS:
+                # Filtre: alan değerinin tüm belirteçleri (önekle) eşleşmeli
+                for token in self.tokenize(value):
+                    allowed = set()
+                    for term in self._prefixed(self.filter_vocab, f"{field.casefold()}:{token}"):
+                        allowed.update(d for d, _ in self.postings[term])
+                    scores = {d: (scores or {}).get(d, 0.0) for d in allowed
+                              if scores is None or d in scores}
+                continue
+            for token in self.tokenize(part):
+                term_scores: Dict[int, float] = {}
+                for term, factor in self.expand(token).items():
+                    postings = self.postings[term]
+                    idf = math.log(1 + total / len(postings))
+                    for doc_id, weight in postings:
+                        term_scores[doc_id] = max(term_scores.get(doc_id, 0.0), weight * factor * idf)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {d: s + term_scores[d] for d, s in scores.items() if d in term_scores}
+        if not scores:
+            return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.docs[item[0]][0]))
+        return [(round(score, 3), self.docs[doc_id]) for doc_id, score in ranked]
+
+class RepoIndex:
+    """Önceden oluşturulmuş, gzip ile sıkıştırılmış depo indeksi (index.json.gz).
+    
+    Her repo için extract_metadata çıktısı, sertifika doğrulama sonucu,
+    çözümlenen dal ve kurulum/kaldırma scriptlerinin SHA-256 özetleri tek
+    dosyada taşınır; istemci kataloğu tek istekle yeniler. generation her
+    yeni indekste artar; digest paket kayıtlarının kanonik JSON'unun
+    SHA-256'sıdır ve açılan indeks bununla doğrulanır. repo_list_sha256
+    indeksin üretildiği repo.alp'nin özetidir; repo.alp değiştiyse indeks
+    eskimiş sayılır.
+    """
+    
+    FORMAT = 2
+    FILENAME = "index.json.gz"
+    
+    def __init__(self, packages: Dict[str, Dict], generation: int = 1, built_at: Optional[str] = None,
+                 repo_list_sha256: Optional[str] = None):
+        self.packages = packages
+        self.generation = generation
+        self.built_at = built_at or datetime.now().isoformat()
+        self.repo_list_sha256 = repo_list_sha256
+    
+    @staticmethod
+    def digest(packages: Dict[str, Dict]) -> str:
+        canonical = json.dumps(packages, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def encode(self) -> bytes:
+        import gzip
+        data = {"format": self.FORMAT, "generation": self.generation, "built_at": self.built_at,
+                "repo_list_sha256": self.repo_list_sha256, "digest": self.digest(self.packages),
+                "packages": self.packages}
+        return gzip.compress(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+                             compresslevel=9, mtime=0)
+    
+    @staticmethod
+    def _load(blob: bytes) -> Dict:
+        import gzip
+        try:
+            data = json.loads(gzip.decompress(blob).decode('utf-8'))
+        except (OSError, EOFError, UnicodeDecodeError) as e:
+            raise ValueError(f"açılamadı: {e}")
+        if not isinstance(data, dict):
+            raise ValueError("beklenmeyen içerik")
+        return data
+    
+    @classmethod
+    def generation_of(cls, blob: bytes) -> int:
+        """Biçimi ne olursa olsun indeksin nesil numarası (okunamıyorsa 0)"""
+        try:
+            generation = cls._load(blob).get("generation", 0)
+        except ValueError:
+            return 0
+        return generation if isinstance(generation, int) and not isinstance(generation, bool) else 0
+    
+    @classmethod
+    def decode(cls, blob: bytes) -> "RepoIndex":
+        """Sıkıştırılmış indeksi aç ve doğrula; geçersizse ValueError fırlat"""
+        data = cls._load(blob)
+        if data.get("format") != cls.FORMAT:
+            raise ValueError(f"desteklenmeyen biçim: {data.get('format')}")
+        generation = data.get("generation")
+        if not isinstance(generation, int) or isinstance(generation, bool) or generation < 0:
+            raise ValueError(f"geçersiz nesil: {generation!r}")
+        repo_list_sha256 = data.get("repo_list_sha256")
+        if not isinstance(repo_list_sha256, str):
+            raise ValueError("repo.alp özeti yok")
+        packages = data.get("packages")
+        if not isinstance(packages, dict) or not all(
+                isinstance(meta, dict) and isinstance(meta.get('url'), str) and meta.get('name') == name
+                for name, meta in packages.items()):
+            raise ValueError("geçersiz paket kayıtları")
+        if cls.digest(packages) != data.get("digest"):
+            raise ValueError("özet uyuşmuyor")
+        return cls(packages, generation, data.get("built_at"), repo_list_sha256)
+
+class AlpArchive:
+    """İkili .alp paket formatı (format_version 2.1; 2.0 paketleri de okunur).
+    
+    Yerleşim:
+        8 bayt   magic (b"ALPPKG\\0\\2")
+        4 bayt   başlık uzunluğu (uint32, big-endian)
+        N bayt   başlık (UTF-8 JSON): metadata, sertifika ve üye dizini
+        ...      üye verileri (ham ya da zlib ile sıkıştırılmış), dizindeki sırayla
+    
+    Dizindeki her üye için ad, boyut, veri bölümüne göre ofset, saklanan
+    boyut, sıkıştırma türü, dosya izinleri ve SHA-256 tutulur. Başlıktaki
+    checksum, checksum alanı dışındaki başlığın (metadata, sertifika ve üye
+    dizini dahil) kanonik JSON'unun SHA-256'sıdır; böylece sürüm ya da
+    sertifika değiştirilmiş bir paket doğrulamadan geçemez ve paketin tamamı
+    ya da tek bir üye ayrı ayrı doğrulanabilir. 2.0 paketlerinde kök özet
+    yalnızca üye dizininden (her satırda "özet boyut ad") türetilirdi. Okuma tarafında yalnızca başlık belleğe
+    alınır; üyeler parça parça açılır ve özetleri yazılırken doğrulanır.
+    """
+    MAGIC = b"ALPPKG\0\2"
+    FORMAT_VERSION = "2.1"
+    # Kök özeti yalnızca üye dizinini kapsayan eski sürüm
+    LEGACY_VERSION = "2.0"
+    COMPRESS_LEVEL = 6
+    # İlk parça bu oranın altına sıkışmıyorsa (ör. zaten sıkıştırılmış veri) üye ham saklanır
+    COMPRESS_RATIO = 0.95
+    EXCLUDED_DIRS = {".git", ".hg", ".svn", "__pycache__"}
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            magic = f.read(len(self.MAGIC))
+            if magic != self.MAGIC:
+                raise ValueError("Geçersiz .alp v2 başlığı")
+            (header_len,) = struct.unpack(">I", f.read(4))
+            self.header = json.loads(f.read(header_len).decode('utf-8'))
+        self.data_offset = len(self.MAGIC) + 4 + header_len
+        self.members = {m["name"]: m for m in self.header.get("members", [])}
+    
+    @classmethod
+    def is_archive(cls, path: Path) -> bool:
+        """Dosyanın v2 ikili paket olup olmadığını ilk baytlardan anla"""
+        try:
+            with open(path, 'rb') as f:
+                return f.read(len(cls.MAGIC)) == cls.MAGIC
+        except OSError:
+            return False
+    
+    @classmethod
+    def collect_members(cls, base_dir: Path, exclude: Optional[List[Path]] = None) -> List[Tuple[str, Path]]:
+        """Dizin ağacındaki normal dosyaları (arşiv adı, yol) olarak sıralı döndür"""
+        excluded = {p.resolve() for p in (exclude or [])}
+        members = []
+        for root, dirs, files in os.walk(base_dir):
+            dirs[:] = sorted(d for d in dirs if d not in cls.EXCLUDED_DIRS)
+            for fname in sorted(files):
+                path = Path(root) / fname
+                if path.is_symlink() or not path.is_file() or path.resolve() in excluded:
+                    continue
+                rel = path.relative_to(base_dir).as_posix()
+                # Kökteki eski derleme çıktıları pakete girmez
+                if '/' not in rel and rel.endswith('.alp'):
+                    continue
+                members.append((rel, path))
+        return members
+    
+    @classmethod
+    def manifest_digest(cls, header: Dict) -> str:
+        """Başlıktan kök özeti hesapla (checksum alanı hariç kanonik JSON)"""
+        if header.get("format_version") == cls.LEGACY_VERSION:
+            manifest = "".join(f"{m['sha256']}  {m['size']}  {m['name']}\n" for m in header.get("members", []))
+        else:
+            manifest = json.dumps({k: v for k, v in header.items() if k != "checksum"},
+                                  sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(manifest.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def write(cls, output_file: Path, members: List[Tuple[str, Path]], header: Dict) -> Dict:
+        """Üyeleri sıkıştırarak paketi yaz; dizini ve kök özeti eklenmiş başlığı döndür.
+        
+        Tek geçişlidir: her kaynak dosya bir kez okunur, SHA-256 ve sıkıştırma
+        aynı anda yapılır. Sıkıştırma kararı ilk parçaya göre verilir; veri
+        geçici bir dosyada biriktirilir ve başlıktan sonra bir kez kopyalanır.
+        """
+        import shutil
+        import tempfile
+        index = []
+        offset = 0
+        with tempfile.TemporaryFile() as spool:
+            for name, path in members:
+                sha256 = hashlib.sha256()
+                compressor = None
+                start = spool.tell()
+                size = 0
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        if size == 0:
+                            probe = zlib.compress(chunk, 1)
+                            if len(probe) < len(chunk) * cls.COMPRESS_RATIO:
+                                compressor = zlib.compressobj(cls.COMPRESS_LEVEL)
+                        size += len(chunk)
+                        sha256.update(chunk)
+                        spool.write(compressor.compress(chunk) if compressor else chunk)
+                    if compressor:
+                        spool.write(compressor.flush())
+                    mode = os.fstat(f.fileno()).st_mode & 0o777
+                stored = spool.tell() - start
+                index.append({
+                    "name": name,
+                    "size": size,
+                    "offset": offset,
+                    "stored_size": stored,
+                    "compression": "zlib" if compressor else "none",
+                    "mode": mode,
+                    "sha256": sha256.hexdigest(),
+                })
+                offset += stored
+            
+            header = {**header, "format_version": cls.FORMAT_VERSION, "members": index}
+            header["checksum"] = cls.manifest_digest(header)
+            header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            
+            tmp_out = output_file.with_name(output_file.name + ".tmp")
+            with open(tmp_out, 'wb') as out:
+                out.write(cls.MAGIC)
+                out.write(struct.pack(">I", len(header_bytes)))
+                out.write(header_bytes)
+                spool.seek(0)
+                shutil.copyfileobj(spool, out, CHUNK_SIZE)
+            os.replace(tmp_out, output_file)
+        return header
+    
+    def _iter_member(self, f, member: Dict):
+        """Tek bir üyenin açılmış verisini parça parça üret"""
+        f.seek(self.data_offset + member["offset"])
+        remaining = member["stored_size"]
+        decompressor = zlib.decompressobj() if member.get("compression") == "zlib" else None
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                raise ValueError(f"Paket kesik: {member['name']}")
+            remaining -= len(chunk)
+            yield decompressor.decompress(chunk) if decompressor else chunk
+        if decompressor:
+            yield decompressor.flush()
+    
+    def read_member(self, name: str) -> bytes:
+        """Küçük bir üyeyi (ör. README.md) belleğe oku ve doğrula"""
+        member = self.members[name]
+        sha256 = hashlib.sha256()
+        parts = []
+        with open(self.path, 'rb') as f:
+            for data in self._iter_member(f, member):
+                sha256.update(data)
+                parts.append(data)
+        if sha256.hexdigest() != member["sha256"]:
+            raise ValueError(f"Üye özeti uyuşmuyor: {name}")
+        return b"".join(parts)
+    
+    def verify_manifest(self) -> bool:
+        """Başlıktaki kök özetin başlığın geri kalanına uyup uymadığını kontrol et (veri okunmaz)"""
+        return self.manifest_digest(self.header) == self.header.get("checksum")
+    
+    def verify_member(self, name: str) -> bool:
+        """Tek bir üyeyi diğerlerine dokunmadan açıp özetini doğrula"""
+        member = self.members[name]
+        sha256 = hashlib.sha256()
+        size = 0
+        with open(self.path, 'rb') as f:
+            for data in self._iter_member(f, member):
+                sha256.update(data)
+                size += len(data)
+        return size == member["size"] and sha256.hexdigest() == member["sha256"]
+    
+    def verify(self) -> List[str]:
+        """Kök özeti ve tüm üyeleri doğrula; bozuk üyelerin adlarını döndür"""
+        bad = [] if self.verify_manifest() else ["<manifest>"]
+        for name in self.members:
+            try:
+                if not self.verify_member(name):
+                    bad.append(name)
+            except (ValueError, zlib.error):
+                bad.append(name)
+        return bad
+    
+    def extract(self, dest_dir: Path) -> None:
+        """Tüm üyeleri akış halinde hedef dizine çıkar; özetleri yazarken doğrula"""
+        dest_root = Path(dest_dir).resolve()
+        with open(self.path, 'rb') as f:
+            for member in self.header.get("members", []):
+                target = (dest_root / member["name"]).resolve()
+                if dest_root not in target.parents:
+                    raise ValueError(f"Geçersiz üye yolu: {member['name']}")
+                target.parent.mkdir(parents=True, exist_ok=True)
+                sha256 = hashlib.sha256()
+                with open(target, 'wb') as out:
+                    for data in self._iter_member(f, member):
+                        sha256.update(data)
+                        out.write(data)
+                if sha256.hexdigest() != member["sha256"]:
+                    raise ValueError(f"Üye özeti uyuşmuyor: {member['name']}")
+                os.chmod(target, member.get("mode", 0o644))
+
+class component_property(functools.cached_property):
+    """İlk erişimde bir kez kurulan, iş parçacığı güvenli cached_property.
+    
+    Python 3.12'den beri cached_property kilit kullanmaz; ilk erişim işçi
+    iş parçacıklarında olursa iki ayrı örnek kurulabilir ve kaybeden örneğe
+    yazılan kayıtlar (negatif cache, nesne adları, erişim kayıtları) yitirilir.
+    """
+    
+    _lock = threading.RLock()
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.attrname]
+        except KeyError:
+            pass
+        with self._lock:
+            return super().__get__(instance, owner)
+
 class PackageManager:
+    """Paket yöneticisi.
+    
+    Alt bileşenler (HTTP istemcisi, cache'ler, durum deposu, sertifikalar) ve
+    veritabanları ilk erişimde kurulur/yüklenir; böylece her komut yalnızca
+    kullandığı parçaların maliyetini öder.
+    """
+    
     def __init__(self):
         self.config = Config()
-        self.cert_manager = CertificateManager()
+        logger.configure(self.config.config)
+        self._catalog_generation = 0
+        self._resolve_cache: Dict[str, Tuple[List[str], List[List[str]], Dict[str, List[str]]]] = {}
+        self._packages: Optional[Dict[str, Dict]] = None
+        self._installed: Optional[Dict[str, Dict]] = None
+        # Ayarlanırsa sorgu komutları renkli metin yerine kayıt üretir (--json/--ndjson)
+        self.output: Optional[RecordWriter] = None
+    
+    @component_property
+    def http(self) -> "HttpClient":
+        return HttpClient(
+            timeout=int(self.config.get("http_timeout", 30)),
+            pool_size=int(self.config.get("http_pool_size", 8)),
+        )
+    
+    @component_property
+    def http_cache(self) -> "HttpCache":
+        return HttpCache(self.config)
+    
+    @component_property
+    def negative_cache(self) -> "NegativeCache":
+        return NegativeCache(int(self.config.get("negative_cache_ttl", 21600)))
+    
+    @component_property
+    def cache(self) -> CacheManager:
+        return CacheManager(self.config)
+    
+    @component_property
+    def objects(self) -> "ObjectStore":
+        return ObjectStore()
+    
+    @component_property
+    def checksums(self) -> "ChecksumCache":
+        return ChecksumCache()
+    
+    @component_property
+    def state(self) -> StateStore:
         self.setup_home()
-        self.packages = {}
-        self.installed = {}
-        self.load_databases()
+        return StateStore()
+    
+    @component_property
+    def cert_manager(self) -> CertificateManager:
+        return CertificateManager(self.state)
+    
+    @component_property
+    def reverse_deps(self) -> "ReverseDependencyIndex":
+        index = ReverseDependencyIndex()
+        if not index.loaded and self.installed:
+            index.rebuild(self.installed, self.packages)
+            index.save()
+        return index
+    
+    @property
+    def packages(self) -> Dict[str, Dict]:
+        """Paket kataloğu; yeniden atandığında katalog nesli artar ve çözümleme cache'i boşalır"""
+        if self._packages is None:
+            self._load_packages()
+        return self._packages
+    
+    @packages.setter
+    def packages(self, value: Dict[str, Dict]) -> None:
+        self._packages = value
+        self._catalog_generation += 1
+        self._resolve_cache = {}
+    
+    @property
+    def installed(self) -> Dict[str, Dict]:
+        """Yüklü paket kayıtları (durum deposundan ilk erişimde yüklenir)"""
+        if self._installed is None:
+            self._load_installed()
+        return self._installed
+    
+    @installed.setter
+    def installed(self, value: Dict[str, Dict]) -> None:
+        self._installed = value
     
     def setup_home(self):
-        """Alp dizin yapısını oluştur"""
+        """Alp dizin yapısını oluştur (yalnızca eksikse)"""
+        if INSTALLED_DIR.is_dir() and ALP_CACHE.is_dir() and ALP_LOGS.is_dir():
+            return
         ALP_HOME.mkdir(parents=True, exist_ok=True)
         ALP_CACHE.mkdir(parents=True, exist_ok=True)
         ALP_LOGS.mkdir(parents=True, exist_ok=True)
         INSTALLED_DIR.mkdir(parents=True, exist_ok=True)
         logger.log("INFO", "Dizin yapısı oluşturuldu")
         
-    def fetch_url(self, url: str, timeout: int = 30) -> Optional[str]:
-        """URL'den içerik indir"""
+    def _http_get(self, url: str, timeout: Optional[int] = None) -> Tuple[int, Optional[bytes]]:
+        """Koşullu GET isteği yap; (HTTP durum kodu, gövde) döndürür.
+        
+        Başarısız HTTP yanıtlarında gövde None olur; ağ hataları yukarı fırlatılır.
+        """
+        if url.startswith('file:'):
+            # Yerel ayna: okumak cache'ten ucuz, HTTP cache'ine kopyalanmaz
+            status, _, body = self.http.request('GET', url, timeout=timeout)
+            return (status, body) if status < 300 else (status, None)
+        cached = self.http_cache.lookup(url)
+        status, headers, body = self.http.request(
+            'GET', url, headers=self.http_cache.conditional_headers(cached), timeout=timeout)
+        if status == 304 and cached:
+            body = self.http_cache.revalidated(url, cached)
+            if body is not None:
+                self.cache.touch(self.http_cache._paths(url)[1])
+                return 200, body
+        if status >= 300:
+            return status, None
+        self.http_cache.store(url, body, headers)
+        if self.http_cache.enabled:
+            self.cache.touch(self.http_cache._paths(url)[1])
+        return status, body
+    
+    def fetch_url(self, url: str, timeout: Optional[int] = None) -> Optional[str]:
+        """URL'den içerik indir (ETag/Last-Modified ile koşullu istek)"""
+        import http.client
         try:
-            req = urllib.request.Request(url, headers={
-                'User-Agent': 'Alp-PackageManager/1.0'
-            })
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                return response.read().decode('utf-8')
-        except urllib.error.URLError as e:
+            status, body = self._http_get(url, timeout)
+        except (OSError, http.client.HTTPException) as e:
             logger.log("ERROR", f"URL indirilemedi: {url} - {e}")
             return None
         except Exception as e:
             logger.log("ERROR", f"Bağlantı hatası: {e}")
             return None
+        if body is None:
+            logger.log("ERROR", f"URL indirilemedi: {url} - HTTP {status}")
+            return None
+        return body.decode('utf-8')
+    
+    def repo_base(self, github_url: str) -> str:
+        """Repo URL'sini /tree/<dal> ekinden arındırılmış kök URL'ye çevir"""
+        return re.sub(r'/tree/[^/]+/?$', '', github_url.rstrip('/'))
+    
+    def mirror_base(self) -> Optional[str]:
+        """Yapılandırılmış ayna kökü (mirror_url); yerel dizin yolu file:// URL'sine çevrilir"""
+        mirror = self.config.get("mirror_url")
+        if not mirror:
+            return None
+        if '://' not in mirror:
+            mirror = Path(mirror).expanduser().resolve().as_uri()
+        return mirror.rstrip('/')
     
-    def download_file(self, url: str, filepath: Path) -> bool:
-        """Dosya indir ve cache'e kaydet"""
+    def repo_list_url(self) -> str:
+        """repo.alp adresi: ayna yapılandırılmışsa aynadaki kopya"""
+        mirror = self.mirror_base()
+        return f"{mirror}/repo.alp" if mirror else REPO_URL
+    
+    def index_url(self) -> str:
+        """Önceden oluşturulmuş depo indeksinin adresi (repo.alp ile aynı dizinde)"""
+        mirror = self.mirror_base()
+        if mirror:
+            return f"{mirror}/{RepoIndex.FILENAME}"
+        return self.config.get("repo_index_url") or f"{REPO_URL.rsplit('/', 1)[0]}/{RepoIndex.FILENAME}"
+    
+    def raw_path(self, github_url: str, filename: str, branch: str = "main") -> str:
+        """Repo dosyasının raw.githubusercontent.com altındaki yolu (aynada aynı yol kullanılır)"""
+        repo_path = re.sub(r'^[a-z]+://[^/]+/', '', self.repo_base(github_url))
+        return f"{repo_path}/refs/heads/{branch}/{filename}"
+    
+    def raw_url(self, github_url: str, filename: str, branch: str = "main") -> str:
+        """Repo dosyasının ham URL'sini oluştur (raw.githubusercontent.com ya da ayna)"""
+        mirror = self.mirror_base()
+        if mirror:
+            return f"{mirror}/{self.raw_path(github_url, filename, branch)}"
+        base = self.repo_base(github_url).replace('github.com', 'raw.githubusercontent.com')
+        return f"{base}/refs/heads/{branch}/{filename}"
+    
+    def branch_candidates(self, github_url: str, preferred: Optional[str] = None) -> List[str]:
+        """Denenecek dalları öncelik sırasıyla döndür: kayıtlı dal, URL'deki dal, main, master"""
+        candidates = []
+        match = re.search(r'/tree/([^/]+)/?$', github_url)
+        for branch in [preferred, match.group(1) if match else None, *DEFAULT_BRANCHES]:
+            if branch and branch not in candidates:
+                candidates.append(branch)
+        return candidates
+    
+    def fetch_repo_file(self, github_url: str, filename: str,
+                        branches: List[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Repo dosyasını verilen dallarda sırayla ara; (içerik, dal) döndürür.
+        
+        404 dönen URL'ler negatif cache'e yazılır ve TTL dolana kadar tekrar istenmez.
+        """
+        for branch in branches:
+            url = self.raw_url(github_url, filename, branch)
+            if self.negative_cache.contains(url):
+                continue
+            try:
+                status, body = self._http_get(url)
+            except Exception as e:
+                logger.log("ERROR", f"URL indirilemedi: {url} - {e}")
+                continue
+            if body is not None:
+                return body.decode('utf-8'), branch
+            if status == 404 and not url.startswith('file:'):
+                self.negative_cache.add(url)
+        return None, None
+    
+    def download_file(self, url: str, filepath: Path, expected_sha256: Optional[str] = None,
+                      show_progress: bool = True) -> Optional[str]:
+        """Dosyayı akış halinde indir; başarıda SHA-256 özetini, hatada None döndür.
+        
+        Veri önce <dosya>.partial içine yazılır ve özet indirme sırasında
+        hesaplanır. Bağlantı koparsa yarım dosya saklanır; bir sonraki çağrıda
+        sunucu ETag/Last-Modified doğrulayıcısı ile HTTP Range isteği yapılarak
+        kalan kısım indirilir. Tamamlanan dosya atomik olarak yerine taşınır.
+        """
+        partial = filepath.with_name(filepath.name + ".partial")
+        partial_meta = filepath.with_name(filepath.name + ".partial.json")
         try:
             filepath.parent.mkdir(parents=True, exist_ok=True)
-            urllib.request.urlretrieve(url, filepath)
+            sha256 = hashlib.sha256()
+            offset = 0
+            headers = {}
+            try:
+                with open(partial_meta, 'r') as f:
+                    resume = json.load(f)
+                if resume.get("url") == url and resume.get("validator") and partial.exists():
+                    with open(partial, 'rb') as f:
+                        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                            sha256.update(chunk)
+                            offset += len(chunk)
+                    headers['Range'] = f"bytes={offset}-"
+                    headers['If-Range'] = resume["validator"]
+            except (OSError, ValueError):
+                pass
+            
+            with self.http.open('GET', url, headers) as resp:
+                if resp.status == 206 and offset:
+                    mode = 'ab'
+                elif resp.status == 200:
+                    # Sunucu Range desteklemiyor ya da dosya değişmiş: baştan indir
+                    mode = 'wb'
+                    sha256 = hashlib.sha256()
+                    offset = 0
+                else:
+                    if resp.status == 416:
+                        partial.unlink(missing_ok=True)
+                        partial_meta.unlink(missing_ok=True)
+                    logger.log("ERROR", f"Dosya indirilemedi: {url} - HTTP {resp.status}")
+                    return None
+                
+                validator = resp.headers.get('ETag') or resp.headers.get('Last-Modified')
+                if mode == 'wb':
+                    if validator:
+                        with open(partial_meta, 'w') as f:
+                            json.dump({"url": url, "validator": validator}, f)
+                    else:
+                        partial_meta.unlink(missing_ok=True)
+                length = resp.headers.get('Content-Length')
+                total = offset + int(length) if length and length.isdigit() else None
+                done = offset
+                progress = show_progress and total and total > CHUNK_SIZE and sys.stdout.isatty()
+                
+                with open(partial, mode) as f:
+                    while True:
+                        chunk = resp.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        sha256.update(chunk)
+                        done += len(chunk)
+                        if progress:
+                            print(f"\r   ↓ {filepath.name} {done * 100 // total:3d}% "
+                                  f"({done // 1024}/{total // 1024} KB)", end='', flush=True)
+                if progress:
+                    print()
+            
+            if total is not None and done != total:
+                logger.log("ERROR", f"İndirme yarım kaldı: {filepath.name} ({done}/{total} bayt), tekrar deneyin")
+                return None
+            
+            digest = sha256.hexdigest()
+            if expected_sha256 and digest != expected_sha256:
+                partial.unlink(missing_ok=True)
+                partial_meta.unlink(missing_ok=True)
+                logger.log("ERROR", f"Checksum uyuşmuyor: {filepath.name}")
+                return None
+            
+            os.replace(partial, filepath)
+            partial_meta.unlink(missing_ok=True)
+            self.checksums.record(filepath, digest)
             logger.log("INFO", f"Dosya indirildi: {filepath.name}")
-            return True
+            # İndirme sonrası cache sınırı korunur; yeni dosya en son erişilen olduğundan en son silinir
+            self.cache.touch(filepath)
+            self.cache.enforce()
+            return digest
         except Exception as e:
             logger.log("ERROR", f"Dosya indirilemedi: {e}")
-            return False
+            return None
+    
+    def fetch_object(self, url: str, ref_name: str, show_progress: bool = True,
+                     expected_sha256: Optional[str] = None,
+                     log: Optional[List[Tuple[str, str]]] = None) -> Optional[str]:
+        """Dosyayı içerik adresli depoya al; başarıda SHA-256 özetini, hatada None döndür.
+        
+        Depo indeksinden gelen expected_sha256 depoda zaten varsa hiç istek
+        yapılmaz. ref_name aynı URL'den daha önce alınmışsa koşullu istek
+        gönderilir; 304 yanıtında gövde indirilmeden mevcut nesne kullanılır.
+        İndirilen içerik depoda zaten varsa yeniden yazılmaz. Bağlantı koparsa
+        yarım dosya saklanır; sonraki çağrıda ETag/Last-Modified ile Range
+        isteği yapılarak kalan kısım indirilir. log verilirse
+        mesajlar doğrudan basılmak yerine (seviye, mesaj) olarak eklenir;
+        paralel kurulum işçileri çıktıyı paket sırasıyla basabilsin diye.
+        """
+        def emit(level: str, message: str) -> None:
+            if log is None:
+                logger.log(level, message)
+            else:
+                log.append((level, message))
+        
+        if expected_sha256 and self.objects.path(expected_sha256).is_file():
+            self.cache.touch(self.objects.path(expected_sha256))
+            emit("DEBUG", f"İndeksteki özet depoda var: {ref_name} ({expected_sha256[:12]})")
+            return expected_sha256
+        tmp = OBJECTS_DIR / f".{os.getpid()}.{threading.get_ident()}.tmp"
+        # Yarım kalan indirme ref adına göre saklanır; devam eden süreç onu önce kendi geçici dosyasına taşır
+        stem = hashlib.sha256(ref_name.encode('utf-8')).hexdigest()[:16]
+        partial = OBJECTS_DIR / f".{stem}.partial"
+        partial_meta = OBJECTS_DIR / f".{stem}.partial.json"
+        validator = None
+        try:
+            OBJECTS_DIR.mkdir(parents=True, exist_ok=True)
+            ref = self.objects.ref(ref_name)
+            headers = self.objects.conditional_headers(ref_name, url)
+            sha256 = hashlib.sha256()
+            offset = 0
+            try:
+                with open(partial_meta, 'r') as f:
+                    resume = json.load(f)
+                if resume.get("url") == url and resume.get("validator"):
+                    os.replace(partial, tmp)
+                    validator = resume["validator"]
+                    with open(tmp, 'rb') as f:
+                        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                            sha256.update(chunk)
+                            offset += len(chunk)
+                    headers = {'Range': f"bytes={offset}-", 'If-Range': resume["validator"]}
+            except (OSError, ValueError):
+                pass
+            
+            with self.http.open('GET', url, headers) as resp:
+                if resp.status == 304 and ref:
+                    resp.read()
+                    digest = ref["sha256"]
+                    self.objects.set_ref(ref_name, digest, url, resp.headers)
+                    self.cache.touch(self.objects.path(digest))
+                    emit("DEBUG", f"Değişmemiş, depodan kullanıldı: {ref_name} ({digest[:12]})")
+                    return digest
+                if resp.status == 206 and offset:
+                    mode = 'ab'
+                    emit("DEBUG", f"Yarım indirme sürdürülüyor: {ref_name} ({offset} bayttan)")
+                elif resp.status == 200:
+                    # Sunucu Range desteklemiyor ya da dosya değişmiş: baştan indir
+                    mode = 'wb'
+                    sha256 = hashlib.sha256()
+                    offset = 0
+                else:
+                    if resp.status == 416:
+                        validator = None
+                        partial_meta.unlink(missing_ok=True)
+                    emit("ERROR", f"Dosya indirilemedi: {url} - HTTP {resp.status}")
+                    return None
+                if mode == 'wb':
+                    validator = resp.headers.get('ETag') or resp.headers.get('Last-Modified')
+                length = resp.headers.get('Content-Length')
+                total = offset + int(length) if length and length.isdigit() else None
+                progress = show_progress and total and total > CHUNK_SIZE and sys.stdout.isatty()
+                done = offset
+                with open(tmp, mode) as f:
+                    while True:
+                        chunk = resp.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        sha256.update(chunk)
+                        done += len(chunk)
+                        if progress:
+                            print(f"\r   ↓ {ref_name} {done * 100 // total:3d}% "
+                                  f"({done // 1024}/{total // 1024} KB)", end='', flush=True)
+                if progress:
+                    print()
+                if total is not None and done != total:
+                    emit("ERROR", f"İndirme yarım kaldı: {ref_name} ({done}/{total} bayt), tekrar deneyin")
+                    return None
+            
+            digest = sha256.hexdigest()
+            validator = None
+            partial_meta.unlink(missing_ok=True)
+            if expected_sha256 and digest != expected_sha256:
+                emit("WARNING", f"{ref_name} depo indeksindeki özetle uyuşmuyor (indeks eski olabilir)")
+            path, new = self.objects.add(tmp, digest)
+            self.objects.set_ref(ref_name, digest, url, resp.headers)
+            self.checksums.record(path, digest)
+            emit("INFO", f"Dosya indirildi: {ref_name}" + ("" if new else " (depoda zaten vardı)"))
+            self.cache.touch(path)
+            self.cache.enforce()
+            return digest
+        except Exception as e:
+            emit("ERROR", f"Dosya indirilemedi: {e}")
+            return None
+        finally:
+            # Doğrulayıcısı olan yarım indirme sonraki çağrıda Range ile sürdürülmek üzere saklanır
+            if validator and tmp.is_file() and tmp.stat().st_size:
+                try:
+                    with open(partial_meta, 'w') as f:
+                        json.dump({"url": url, "validator": validator}, f)
+                    os.replace(tmp, partial)
+                except OSError:
+                    pass
+            tmp.unlink(missing_ok=True)
     
     def calculate_checksum(self, filepath: Path) -> str:
-        """Dosya checksum'ı hesapla"""
-        sha256 = hashlib.sha256()
-        with open(filepath, 'rb') as f:
-            sha256.update(f.read())
-        return sha256.hexdigest()
+        """Dosya checksum'ı hesapla (değişmemiş dosyalar için cache'ten gelir)"""
+        return self.checksums.checksum(filepath)
     
     def parse_readme(self, github_url: str) -> Optional[Dict]:
         """GitHub URL'sinden README.md'yi indir ve parse et"""
-        github_url = github_url.rstrip('/')
-        
-        if '/tree/main' in github_url:
-            github_url = github_url.replace('/tree/main', '')
-        
-        readme_url = github_url.replace("github.com", "raw.githubusercontent.com") + "/refs/heads/main/README.md"
-        
-        content = self.fetch_url(readme_url)
+        content, branch = self.fetch_readme(github_url)
         if not content:
-            readme_url_master = github_url.replace("github.com", "raw.githubusercontent.com") + "/refs/heads/master/README.md"
-            content = self.fetch_url(readme_url_master)
-            if not content:
-                logger.log("WARNING", f"README.md bulunamadı: {github_url}")
-                return None
-        
-        return self.extract_metadata(content)
+            return None
+        metadata = self.extract_metadata(content)
+        metadata['branch'] = branch
+        return metadata
+    
+    def fetch_readme(self, github_url: str, branch: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Ham README.md içeriğini indir; (içerik, bulunduğu dal) döndürür"""
+        content, found_branch = self.fetch_repo_file(
+            github_url, "README.md", self.branch_candidates(github_url, branch))
+        if not content:
+            logger.log("WARNING", f"README.md bulunamadı: {self.repo_base(github_url)}")
+        return content, found_branch
     
     def extract_metadata(self, content: str) -> Dict:
         """README.md'den metadata çıkar"""
@@ -356,14 +2347,18 @@ class PackageManager:
         
         return metadata
 
-    def parse_cert_alpc(self, github_url: str) -> Optional[Dict]:
+    def parse_cert_alpc(self, github_url: str, branch: Optional[str] = None) -> Optional[Dict]:
         """GitHub repo kökünden cerf.alpc dosyasını indir ve doğrula"""
-        base = github_url.rstrip('/')
-        if '/tree/main' in base:
-            base = base.replace('/tree/main', '')
-        raw_main = base.replace('github.com', 'raw.githubusercontent.com') + '/refs/heads/main/cerf.alpc'
-        raw_master = base.replace('github.com', 'raw.githubusercontent.com') + '/refs/heads/master/cerf.alpc'
-        content = self.fetch_url(raw_main) or self.fetch_url(raw_master)
+        return self.verify_cert_content(self.fetch_cert_alpc(github_url, branch), github_url)
+    
+    def fetch_cert_alpc(self, github_url: str, branch: Optional[str] = None) -> Optional[str]:
+        """Ham cerf.alpc içeriğini indir; dal biliniyorsa yalnızca o dala bakılır"""
+        branches = [branch] if branch else self.branch_candidates(github_url)
+        content, _ = self.fetch_repo_file(github_url, "cerf.alpc", branches)
+        return content
+    
+    def verify_cert_content(self, content: Optional[str], github_url: str) -> Optional[Dict]:
+        """cerf.alpc içeriğini doğrula ve paket kaydına eklenecek alanları döndür"""
         if not content:
             return None
         try:
@@ -379,8 +2374,23 @@ class PackageManager:
             'cert_message': msg
         }
     
-    def compile_package(self, directory: str, add_certificate: bool = True) -> bool:
-        """Paket dizinini .alp dosyasına derle ve sertifikala"""
+    # compile için kabul edilen sertifika seçimleri (etkileşimli menü numaraları dahil)
+    CERT_CHOICES = {
+        "1": "custom", "custom": "custom",
+        "2": "official", "official": "official",
+        "3": "none", "none": "none", "unsigned": "none",
+    }
+    
+    def compile_package(self, directory: str, add_certificate: bool = True,
+                        cert_choice: Optional[str] = None, signer: Optional[str] = None,
+                        password: Optional[str] = None, output_dir: Optional[str] = None) -> bool:
+        """Paket dizinini .alp dosyasına derle ve sertifikala.
+        
+        cert_choice verilmezse sertifika türü etkileşimli olarak sorulur.
+        Verilirse (custom/official/none) hiçbir soru sorulmaz: imzalayan için
+        signer, yoksa README'deki yazar kullanılır; official için password
+        zorunludur ve hatalı şifre derlemeyi başarısız kılar.
+        """
         dir_path = Path(directory)
         
         if not dir_path.exists() or not dir_path.is_dir():
@@ -423,91 +2433,85 @@ class PackageManager:
         package_name = metadata['name']
         version = metadata['version']
         author = metadata.get('author', 'Unknown')
-        output_file = Path.cwd() / f"{package_name}-{version}.alp"
+        output_file = Path(output_dir or Path.cwd()) / f"{package_name}-{version}.alp"
         
         print(f"{Colors.BOLD}{Colors.CYAN}📦 Paket derleniyor: {package_name} v{version}{Colors.ENDC}")
         
         # Sertifika işlemleri
         certificate = None
         if add_certificate:
-            print(f"\n{Colors.BOLD}{Colors.YELLOW}🔒 Sertifika Sistemi{Colors.ENDC}")
-            print(f"{Colors.CYAN}Bu paketin sertifikalanmasını ister misiniz?{Colors.ENDC}")
-            print(f"{Colors.YELLOW}Sertifikasız paketler kurulurken uyarı verir ve nereden geldiği belli olmaz.{Colors.ENDC}")
+            interactive = cert_choice is None
+            if interactive:
+                print(f"\n{Colors.BOLD}{Colors.YELLOW}🔒 Sertifika Sistemi{Colors.ENDC}")
+                print(f"{Colors.CYAN}Bu paketin sertifikalanmasını ister misiniz?{Colors.ENDC}")
+                print(f"{Colors.YELLOW}Sertifikasız paketler kurulurken uyarı verir ve nereden geldiği belli olmaz.{Colors.ENDC}")
+                
+                cert_choice = input("\n1) Özel Sertifika (Kendi isminizle)\n2) Official Alp Sertifikası (Şifre gerekli)\n3) Sertifikasız\n\nSeçiminiz (1/2/3): ").strip()
             
-            cert_choice = input(f"\n1) Özel Sertifika (Kendi isminizle)\n2) Official Alp Sertifikası (Şifre gerekli)\n3) Sertifikasız\n\nSeçiminiz (1/2/3): ").strip()
+            choice = self.CERT_CHOICES.get(cert_choice.strip().lower())
+            if choice is None and not interactive:
+                logger.log("ERROR", f"Geçersiz sertifika seçimi: {cert_choice} (custom/official/none)")
+                return False
             
-            if cert_choice == "1":
-                author_name = input(f"İmzalayan kişinin adı [{author}]: ").strip() or author
+            if choice == "custom":
+                if signer:
+                    author_name = signer
+                elif interactive:
+                    author_name = input(f"İmzalayan kişinin adı [{author}]: ").strip() or author
+                else:
+                    author_name = author
                 certificate = self.cert_manager.generate_certificate(package_name, author_name, "custom")
                 print(f"{Colors.GREEN}✓ Özel sertifika oluşturuldu{Colors.ENDC}")
             
-            elif cert_choice == "2":
-                password = input("Official sertifika şifresini girin: ").strip()
+            elif choice == "official":
+                if password is None:
+                    if not interactive:
+                        logger.log("ERROR", "Official sertifika için ALP_OFFICIAL_PASSWORD tanımlanmalı")
+                        return False
+                    password = input("Official sertifika şifresini girin: ").strip()
                 password_hash = hashlib.sha256(password.encode()).hexdigest()
                 
                 if password_hash == OFFICIAL_CERT_KEY:
                     certificate = self.cert_manager.generate_certificate(package_name, "Alp Official", "official")
                     print(f"{Colors.GREEN}✓ Official Alp sertifikası oluşturuldu 🏆{Colors.ENDC}")
-                else:
+                elif interactive:
                     print(f"{Colors.RED}✗ Hatalı şifre! Sertifikasız devam ediliyor.{Colors.ENDC}")
+                else:
+                    logger.log("ERROR", f"Hatalı official sertifika şifresi: {package_name}")
+                    return False
         
-        # Dosyaları oku ve base64 encode et
+        # Dizin ağacını ikili .alp (v2) paketine yaz
         try:
-            with open(alp_sh, 'rb') as f:
-                install_script = base64.b64encode(f.read()).decode('utf-8')
-            
-            with open(alp_u_sh, 'rb') as f:
-                uninstall_script = base64.b64encode(f.read()).decode('utf-8')
+            members = AlpArchive.collect_members(dir_path, exclude=[output_file])
+            member_names = {name for name, _ in members}
             
             # Ana dosyayı kontrol et (opsiyonel)
-            main_file_content = None
             main_file_name = None
             if 'main' in metadata:
-                main_file = dir_path / metadata['main']
-                if main_file.exists():
-                    with open(main_file, 'rb') as f:
-                        main_file_content = base64.b64encode(f.read()).decode('utf-8')
+                if Path(metadata['main']).as_posix() in member_names:
                     main_file_name = metadata['main']
                     print(f"{Colors.GREEN}✓{Colors.ENDC} Ana dosya bulundu: {main_file_name}")
                 else:
                     logger.log("WARNING", f"Ana dosya bulunamadı: {metadata['main']}")
             
-            # .alp paketi oluştur (JSON formatı)
-            alp_package = {
-                "format_version": "1.2",
+            header = AlpArchive.write(output_file, members, {
                 "metadata": metadata,
-                "files": {
-                    "install_script": install_script,
-                    "uninstall_script": uninstall_script,
-                    "readme": readme_content
-                },
                 "certificate": certificate,
                 "compiled_at": datetime.now().isoformat(),
-                "checksum": ""
-            }
-            
-            # Ana dosya varsa ekle
-            if main_file_content and main_file_name:
-                alp_package["files"]["main_file"] = main_file_content
-                alp_package["files"]["main_file_name"] = main_file_name
-            
-            # JSON'u string'e çevir
-            package_json = json.dumps(alp_package, indent=2, ensure_ascii=False)
-            
-            # Checksum hesapla
-            checksum = hashlib.sha256(package_json.encode()).hexdigest()
-            alp_package["checksum"] = checksum
-            
-            # Dosyaya yaz
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(alp_package, f, indent=2, ensure_ascii=False)
+            })
+            checksum = header["checksum"]
+            total_size = sum(m["size"] for m in header["members"])
             
             file_size = output_file.stat().st_size / 1024
+            # Dosya özeti cache'e girer; aynı paketin install-local doğrulaması stat ile biter
+            file_digest = self.calculate_checksum(output_file)
             
             logger.log("SUCCESS", f"Paket oluşturuldu: {output_file.name}")
             print(f"\n{Colors.GREEN}✓{Colors.ENDC} Dosya: {output_file}")
-            print(f"{Colors.GREEN}✓{Colors.ENDC} Boyut: {file_size:.2f} KB")
+            print(f"{Colors.GREEN}✓{Colors.ENDC} Boyut: {file_size:.2f} KB "
+                  f"({len(members)} dosya, açılmış {total_size / 1024:.2f} KB)")
             print(f"{Colors.GREEN}✓{Colors.ENDC} Checksum: {checksum[:16]}...")
+            print(f"{Colors.GREEN}✓{Colors.ENDC} SHA-256: {file_digest[:16]}...")
             
             if certificate:
                 if certificate.get("type") == "official":
@@ -527,6 +2531,41 @@ class PackageManager:
             logger.log("ERROR", f"Paket derlenemedi: {e}")
             return False
     
+    def compile_many(self, directories: List[str], jobs: Optional[int] = None, **options) -> bool:
+        """Birden çok paket dizinini süreç havuzunda derle ve özet yazdır.
+        
+        Her paketin çıktısı ayrı yakalanır ve dizin sırasıyla basılır.
+        Herhangi bir paket başarısız olursa False döner.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        jobs = max(1, min(jobs or os.cpu_count() or 1, len(directories)))
+        print(f"{Colors.BOLD}{Colors.CYAN}📦 {len(directories)} paket derleniyor ({jobs} işçi)...{Colors.ENDC}\n")
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_compile_worker, d, options) for d in directories]
+            results = []
+            for directory, future in zip(directories, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append((directory, False, f"{e}\n"))
+        
+        for directory, ok, output in results:
+            print(f"{Colors.BOLD}── {directory}{Colors.ENDC}")
+            print(output.rstrip())
+            print()
+        
+        failed = [d for d, ok, _ in results if not ok]
+        print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
+        for directory, ok, _ in results:
+            mark = f"{Colors.GREEN}✓{Colors.ENDC}" if ok else f"{Colors.RED}✗{Colors.ENDC}"
+            print(f"  {mark} {directory}")
+        print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
+        if failed:
+            logger.log("ERROR", f"{len(failed)}/{len(results)} paket derlenemedi")
+            return False
+        logger.log("SUCCESS", f"{len(results)} paket derlendi")
+        return True
+    
     def create_alpc(self, package_name: str, author: str, cert_type: str) -> bool:
         """Mevcut dizinde cerf.alpc oluştur"""
         cert_type = cert_type.lower()
@@ -554,6 +2593,7 @@ class PackageManager:
     def scan_alpc_repo(self, github_url: str) -> bool:
         """GitHub repo için cerf.alpc taraması ve çıktı"""
         info = self.parse_cert_alpc(github_url)
+        self.negative_cache.save()
         if not info:
             print(f"{Colors.YELLOW}⚠️  cerf.alpc bulunamadı ya da erişilemedi{Colors.ENDC}")
             return False
@@ -569,6 +2609,9 @@ class PackageManager:
 
     def install_local_package(self, alp_file: str) -> bool:
         """Yerel .alp dosyasını kur"""
+        import base64
+        import shutil
+        import subprocess
         alp_path = Path(alp_file)
         
         if not alp_path.exists():
@@ -579,16 +2622,26 @@ class PackageManager:
             logger.log("ERROR", "Dosya uzantısı .alp olmalıdır")
             return False
         
+        temp_dir = None
         try:
-            # .alp dosyasını oku
-            with open(alp_path, 'r', encoding='utf-8') as f:
-                alp_package = json.load(f)
+            # .alp dosyasını oku: v2 ikili paketlerde yalnızca başlık belleğe alınır
+            archive = None
+            if AlpArchive.is_archive(alp_path):
+                archive = AlpArchive(alp_path)
+                alp_package = archive.header
+            else:
+                with open(alp_path, 'r', encoding='utf-8') as f:
+                    alp_package = json.load(f)
             
             # Format kontrolü
             format_version = alp_package.get("format_version", "1.0")
-            if format_version not in ["1.0", "1.1", "1.2"]:
+            if format_version not in ["1.0", "1.1", "1.2", AlpArchive.LEGACY_VERSION, AlpArchive.FORMAT_VERSION]:
                 logger.log("ERROR", "Desteklenmeyen paket formatı")
                 return False
+            # Kök özet, mevcut kuruluma dokunulmadan ve soru sorulmadan önce doğrulanır
+            if archive and not archive.verify_manifest():
+                logger.log("ERROR", "Paket manifest özeti uyuşmuyor")
+                return False
             
             metadata = alp_package["metadata"]
             package_name = metadata["name"]
@@ -620,46 +2673,60 @@ class PackageManager:
                     return False
                 print()
             
-            # Zaten yüklü mü kontrol et
-            if package_name in self.installed:
+            # Zaten yüklü mü kontrol et; eski kurulum yeni alp.sh başarılı olana kadar korunur
+            reinstall = package_name in self.installed
+            if reinstall:
                 logger.log("WARNING", f"Paket zaten yüklü: {package_name}")
-                response = input(f"Yeniden yüklemek ister misiniz? (e/h): ")
+                response = input("Yeniden yüklemek ister misiniz? (e/h): ")
                 if response.lower() != 'e':
                     return False
-                self.remove(package_name)
             
             # Geçici dizin oluştur
             temp_dir = ALP_CACHE / f"install_{package_name}"
             temp_dir.mkdir(parents=True, exist_ok=True)
+            self.cache.acquire(temp_dir)
             
-            # Scriptleri decode et ve kaydet
             install_script = temp_dir / "alp.sh"
             uninstall_script = temp_dir / "alp_u.sh"
-            
-            install_data = base64.b64decode(alp_package["files"]["install_script"])
-            uninstall_data = base64.b64decode(alp_package["files"]["uninstall_script"])
-            
-            with open(install_script, 'wb') as f:
-                f.write(install_data)
-            
-            with open(uninstall_script, 'wb') as f:
-                f.write(uninstall_data)
-            
-            # Ana dosyayı çıkar (varsa)
             main_file_path = None
-            if "main_file" in alp_package["files"] and "main_file_name" in alp_package["files"]:
-                main_file_name = alp_package["files"]["main_file_name"]
-                main_file_data = base64.b64decode(alp_package["files"]["main_file"])
-                main_file_path = temp_dir / main_file_name
+            
+            if archive:
+                # v2: tüm dizin ağacı akış halinde çıkarılır ve üye özetleri doğrulanır
+                archive.extract(temp_dir)
+                if not install_script.is_file() or not uninstall_script.is_file():
+                    logger.log("ERROR", "Pakette alp.sh veya alp_u.sh yok")
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+                    return False
+                if metadata.get('main') and (temp_dir / metadata['main']).is_file():
+                    main_file_path = temp_dir / metadata['main']
+                    print(f"{Colors.GREEN}✓{Colors.ENDC} Ana dosya çıkarıldı: {metadata['main']}")
+                print(f"{Colors.GREEN}✓{Colors.ENDC} {len(archive.members)} dosya çıkarıldı")
+            else:
+                # Scriptleri decode et ve kaydet
+                install_data = base64.b64decode(alp_package["files"]["install_script"])
+                uninstall_data = base64.b64decode(alp_package["files"]["uninstall_script"])
                 
-                with open(main_file_path, 'wb') as f:
-                    f.write(main_file_data)
+                with open(install_script, 'wb') as f:
+                    f.write(install_data)
                 
-                # Dosya uzantısına göre izinleri ayarla
-                if main_file_name.endswith('.sh') or main_file_name.endswith('.py'):
-                    os.chmod(main_file_path, 0o755)
+                with open(uninstall_script, 'wb') as f:
+                    f.write(uninstall_data)
                 
-                print(f"{Colors.GREEN}✓{Colors.ENDC} Ana dosya çıkarıldı: {main_file_name}")
+                # Ana dosyayı çıkar (varsa)
+                if "main_file" in alp_package["files"] and "main_file_name" in alp_package["files"]:
+                    main_file_name = alp_package["files"]["main_file_name"]
+                    main_file_data = base64.b64decode(alp_package["files"]["main_file"])
+                    main_file_path = temp_dir / main_file_name
+                    main_file_path.parent.mkdir(parents=True, exist_ok=True)
+                    
+                    with open(main_file_path, 'wb') as f:
+                        f.write(main_file_data)
+                    
+                    # Dosya uzantısına göre izinleri ayarla
+                    if main_file_name.endswith('.sh') or main_file_name.endswith('.py'):
+                        os.chmod(main_file_path, 0o755)
+                    
+                    print(f"{Colors.GREEN}✓{Colors.ENDC} Ana dosya çıkarıldı: {main_file_name}")
             
             # İzinleri ayarla
             os.chmod(install_script, 0o755)
@@ -667,6 +2734,7 @@ class PackageManager:
             
             # Ana dosya yolunu environment variable olarak belirt
             env = os.environ.copy()
+            env['ALP_PACKAGE_DIR'] = str(temp_dir)
             if main_file_path:
                 env['ALP_MAIN_FILE'] = str(main_file_path)
                 env['ALP_MAIN_NAME'] = main_file_path.name
@@ -682,20 +2750,27 @@ class PackageManager:
             )
             
             if result.returncode == 0:
-                # Paket dizinini oluştur
+                # Paket dizinini oluştur; yeniden kurulumda eski sürümün dosyaları temizlenir
                 pkg_dir = INSTALLED_DIR / package_name
+                if reinstall:
+                    shutil.rmtree(pkg_dir, ignore_errors=True)
+                    self.reverse_deps.discard(package_name)
                 pkg_dir.mkdir(parents=True, exist_ok=True)
                 
-                # Uninstall scriptini kopyala
-                shutil.copy2(uninstall_script, pkg_dir / "alp_u.sh")
-                
-                # Ana dosyayı kopyala (varsa)
-                if main_file_path and main_file_path.exists():
-                    shutil.copy2(main_file_path, pkg_dir / main_file_path.name)
-                
-                # README'yi kaydet
-                with open(pkg_dir / "README.md", 'w', encoding='utf-8') as f:
-                    f.write(alp_package["files"]["readme"])
+                if archive:
+                    # Paket ağacının tamamını (alp_u.sh, README.md, ana dosya dahil) kopyala
+                    shutil.copytree(temp_dir, pkg_dir, dirs_exist_ok=True)
+                else:
+                    # Uninstall scriptini kopyala
+                    shutil.copy2(uninstall_script, pkg_dir / "alp_u.sh")
+                    
+                    # Ana dosyayı kopyala (varsa)
+                    if main_file_path and main_file_path.exists():
+                        shutil.copy2(main_file_path, pkg_dir / main_file_path.name)
+                    
+                    # README'yi kaydet
+                    with open(pkg_dir / "README.md", 'w', encoding='utf-8') as f:
+                        f.write(alp_package["files"]["readme"])
                 
                 # Metadata kaydet
                 install_info = {
@@ -704,6 +2779,7 @@ class PackageManager:
                     'source': 'local',
                     'alp_file': str(alp_path.absolute()),
                     'checksum': alp_package.get("checksum", ""),
+                    'file_sha256': self.calculate_checksum(alp_path),
                     'certified': certificate is not None,
                     'cert_type': certificate.get("type") if certificate else None
                 }
@@ -711,13 +2787,15 @@ class PackageManager:
                 with open(pkg_dir / "installed.json", 'w') as f:
                     json.dump(install_info, f, indent=2)
                 
-                # Sertifikayı kaydet
-                if certificate:
-                    self.cert_manager.register_certificate(package_name, certificate)
-                
-                # Veritabanını güncelle
+                # Sertifika ve kurulum kaydı tek işlemde yazılır
+                install_info['disk_usage'] = self._measure_disk_usage(package_name)
                 self.installed[package_name] = install_info
-                self.save_installed()
+                with self.state.transaction():
+                    if certificate:
+                        self.cert_manager.register_certificate(package_name, certificate)
+                    self.save_installed(package_name)
+                self.reverse_deps.add(package_name, install_info.get('dependencies', []))
+                self.reverse_deps.save()
                 
                 # Geçici dosyaları temizle
                 shutil.rmtree(temp_dir, ignore_errors=True)
@@ -741,44 +2819,428 @@ class PackageManager:
         except json.JSONDecodeError:
             logger.log("ERROR", "Geçersiz .alp dosya formatı")
             return False
+        except (ValueError, struct.error, zlib.error) as e:
+            logger.log("ERROR", f"Bozuk .alp paketi: {e}")
+            return False
         except Exception as e:
             logger.log("ERROR", f"Kurulum hatası: {e}")
             return False
+        finally:
+            if temp_dir is not None:
+                self.cache.release(temp_dir)
     
-    def update_repo(self, force: bool = False) -> bool:
-        """Depoyu güncelle"""
-        if not force and INSTALLED_DB.exists():
-            stat = INSTALLED_DB.stat()
+    def verify_package(self, alp_file: str, member: Optional[str] = None) -> bool:
+        """Yerel .alp paketinin (ya da tek bir üyesinin) bütünlüğünü doğrula"""
+        alp_path = Path(alp_file)
+        if not alp_path.is_file():
+            logger.log("ERROR", f".alp dosyası bulunamadı: {alp_file}")
+            return False
+        
+        try:
+            if not AlpArchive.is_archive(alp_path):
+                # Eski JSON paketleri: checksum alanı boşaltılıp aynı biçimde yeniden serileştirilir
+                with open(alp_path, 'r', encoding='utf-8') as f:
+                    alp_package = json.load(f)
+                expected = alp_package.get("checksum", "")
+                alp_package["checksum"] = ""
+                actual = hashlib.sha256(json.dumps(alp_package, indent=2, ensure_ascii=False).encode()).hexdigest()
+                ok = bool(expected) and actual == expected
+                print(f"{Colors.BOLD}{alp_path.name}{Colors.ENDC} (format {alp_package.get('format_version', '1.0')})")
+            elif member:
+                archive = AlpArchive(alp_path)
+                if member not in archive.members:
+                    logger.log("ERROR", f"Pakette böyle bir üye yok: {member}")
+                    return False
+                ok = archive.verify_manifest() and archive.verify_member(member)
+                print(f"{Colors.BOLD}{alp_path.name}{Colors.ENDC} → {member} "
+                      f"({archive.members[member]['sha256'][:16]}...)")
+            else:
+                archive = AlpArchive(alp_path)
+                bad = archive.verify()
+                ok = not bad
+                print(f"{Colors.BOLD}{alp_path.name}{Colors.ENDC} (format {archive.header.get('format_version')}, "
+                      f"{len(archive.members)} üye, kök özet {archive.header.get('checksum', '')[:16]}...)")
+                for name in bad:
+                    print(f"  {Colors.RED}✗{Colors.ENDC} {name}")
+        except (ValueError, OSError, struct.error, zlib.error) as e:
+            logger.log("ERROR", f"Paket okunamadı: {e}")
+            return False
+        
+        if ok:
+            logger.log("SUCCESS", "Paket bütünlüğü doğrulandı")
+        else:
+            logger.log("ERROR", "Paket bütünlük doğrulaması başarısız")
+        return ok
+    
+    def diff_packages(self, old_file: str, new_file: str) -> bool:
+        """İki .alp v2 paketinin üyelerini yalnızca manifest özetlerine göre karşılaştır"""
+        try:
+            old = AlpArchive(Path(old_file)).members
+            new = AlpArchive(Path(new_file)).members
+        except (ValueError, OSError, struct.error) as e:
+            logger.log("ERROR", f"Paket okunamadı (yalnızca v2 paketler karşılaştırılabilir): {e}")
+            return False
+        
+        old_by_digest = {}
+        for name, m in old.items():
+            old_by_digest.setdefault(m["sha256"], name)
+        identical, changed, added, moved = [], [], [], []
+        for name, m in new.items():
+            if name in old:
+                (identical if old[name]["sha256"] == m["sha256"] else changed).append(name)
+            elif m["sha256"] in old_by_digest:
+                moved.append(f"{old_by_digest[m['sha256']]} → {name}")
+            else:
+                added.append(name)
+        removed = [n for n in old if n not in new]
+        
+        print(f"\n{Colors.BOLD}{Colors.CYAN}📦 {Path(old_file).name} ↔ {Path(new_file).name}{Colors.ENDC}")
+        print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
+        for title, items, color in [("Aynı", identical, Colors.GREEN), ("Taşınmış", moved, Colors.GREEN),
+                                    ("Değişmiş", changed, Colors.YELLOW), ("Yeni", added, Colors.CYAN),
+                                    ("Silinmiş", removed, Colors.RED)]:
+            print(f"  {Colors.BOLD}{title}:{Colors.ENDC} {len(items)}")
+            if title != "Aynı":
+                for item in items:
+                    print(f"    {color}•{Colors.ENDC} {item}")
+        same_bytes = sum(new[n]["size"] for n in identical)
+        print(f"  {Colors.BOLD}Ortak veri:{Colors.ENDC} {same_bytes / 1024:.2f} KB")
+        print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}\n")
+        return True
+    
+    def update_repo(self, force: bool = False, full: bool = False) -> bool:
+        """Depoyu güncelle.
+        
+        Önce önceden oluşturulmuş depo indeksi (index.json.gz) tek istekle
+        denenir; indeks yoksa, bozuksa ya da bilinen nesilden eskiyse repolar
+        tek tek taranır. Tarama varsayılan olarak artımlıdır: önceki
+        packages.json ile karşılaştırılır, yalnızca yeni eklenen ve içerik
+        parmak izi (README + cerf.alpc) değişen repolar yeniden ayrıştırılır;
+        repo.alp'den çıkarılan repolar silinir. full=True tüm kataloğu baştan
+        oluşturur. Her iki modda da added_date paketin ilk görüldüğü zamanı korur.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        if not force and PACKAGES_DB.exists():
+            stat = PACKAGES_DB.stat()
             if time.time() - stat.st_mtime < self.config.get("update_interval"):
                 logger.log("INFO", "Depo zaten güncellidir")
                 return True
         
-        print(f"{Colors.BOLD}{Colors.CYAN}📦 Depo güncelleniyor...{Colors.ENDC}")
-        repo_content = self.fetch_url(REPO_URL)
-        if not repo_content:
-            logger.log("ERROR", "Depo güncellenemedi")
-            return False
+        print(f"{Colors.BOLD}{Colors.CYAN}📦 Depo güncelleniyor...{Colors.ENDC}")
+        previous = {pkg['url']: pkg for pkg in self.packages.values() if pkg.get('url')}
+        
+        from_index = self._index_entries(previous, full) if self.config.get("repo_index", True) else None
+        if from_index:
+            repo_urls, results = from_index
+        else:
+            repo_content = self.fetch_url(self.repo_list_url())
+            if not repo_content:
+                logger.log("ERROR", "Depo güncellenemedi")
+                return False
+            
+            repo_urls = self.parse_repo_list(repo_content)
+            
+            def refresh(repo_url: str) -> Tuple[str, Optional[Dict]]:
+                return self._fetch_repo_entry(repo_url, previous.get(repo_url), full)
+            
+            # README ve cerf.alpc indirmeleri sınırlı sayıda iş parçacığıyla paralel yapılır.
+            # pool.map sonuçları repo.alp sırasıyla döndürür, packages.json deterministik kalır.
+            workers = max(1, int(self.config.get("refresh_workers", 8)))
+            with ThreadPoolExecutor(max_workers=min(workers, max(1, len(repo_urls)))) as pool:
+                results = list(pool.map(refresh, repo_urls))
+        
+        self.packages = {}
+        counts = {"added": 0, "changed": 0, "unchanged": 0}
+        for repo_url, (state, metadata) in zip(repo_urls, results):
+            logger.log("DEBUG", f"Repo tarandı: {repo_url} ({state})")
+            if metadata:
+                self.packages[metadata['name']] = metadata
+                counts[state] += 1
+        removed = len(set(previous) - set(repo_urls))
+        
+        self.save_packages()
+        self.reverse_deps.rebuild(self.installed, self.packages)
+        self.reverse_deps.save()
+        self.negative_cache.save()
+        self.http_cache.prune()
+        logger.log("SUCCESS", f"Depo güncellendi: {len(self.packages)} paket bulundu "
+                              f"(yeni: {counts['added']}, değişen: {counts['changed']}, "
+                              f"aynı: {counts['unchanged']}, silinen: {removed})"
+                              + (" [indeks]" if from_index else ""))
+        return True
+    
+    def _index_entries(self, previous: Dict[str, Dict],
+                       full: bool = False) -> Optional[Tuple[List[str], List[Tuple[str, Optional[Dict]]]]]:
+        """Depo indeksini indirip (repo URL'leri, [(durum, metadata)]) döndür; kullanılamıyorsa None.
+        
+        Bilinen nesilden eski bir indeks (ör. geride kalmış bir ayna) ve
+        üretildiği repo.alp güncel repo.alp'den farklı olan indeks reddedilir;
+        repo.alp koşullu istekle alınır, değişmediyse gövde inmez.
+        """
+        url = self.index_url()
+        if self.negative_cache.contains(url):
+            return None
+        try:
+            status, blob = self._http_get(url)
+        except Exception as e:
+            logger.log("DEBUG", f"Depo indeksi alınamadı: {url} - {e}")
+            return None
+        if blob is None:
+            logger.log("DEBUG", f"Depo indeksi yok: {url} - HTTP {status}, repolar taranacak")
+            if status == 404 and not url.startswith('file:'):
+                self.negative_cache.add(url)
+            return None
+        try:
+            index = RepoIndex.decode(blob)
+        except ValueError as e:
+            logger.log("WARNING", f"Depo indeksi geçersiz ({e}), repolar taranacak")
+            return None
+        
+        known = json.loads(self.state.get_meta("repo_index") or "{}")
+        if index.generation < known.get("generation", 0):
+            logger.log("WARNING", f"Depo indeksi eski (nesil {index.generation} < {known['generation']}), "
+                                  f"repolar taranacak")
+            return None
+        
+        try:
+            status, repo_list = self._http_get(self.repo_list_url())
+        except Exception as e:
+            logger.log("WARNING", f"repo.alp alınamadı ({e}), repolar taranacak")
+            return None
+        if repo_list is None:
+            logger.log("WARNING", f"repo.alp alınamadı (HTTP {status}), repolar taranacak")
+            return None
+        if hashlib.sha256(repo_list).hexdigest() != index.repo_list_sha256:
+            logger.log("WARNING", "Depo indeksi repo.alp ile uyuşmuyor (index-build yeniden çalıştırılmalı), "
+                                  "repolar taranacak")
+            return None
+        
+        repo_urls, results = [], []
+        for metadata in index.packages.values():
+            repo_url = metadata['url']
+            prev = previous.get(repo_url)
+            if not prev:
+                state = "added"
+            elif not full and prev.get('fingerprint') == metadata.get('fingerprint'):
+                state = "unchanged"
+            else:
+                state = "changed"
+            metadata = {**metadata, 'added_date': (prev or {}).get('added_date')
+                        or metadata.get('added_date') or datetime.now().isoformat()}
+            repo_urls.append(repo_url)
+            results.append((state, metadata))
+        self.state.set_meta("repo_index", json.dumps({"generation": index.generation,
+                                                       "digest": RepoIndex.digest(index.packages)}))
+        logger.log("DEBUG", f"Depo indeksi kullanıldı: nesil {index.generation}, {len(repo_urls)} repo")
+        return repo_urls, results
+    
+    def build_index(self, output: Optional[str] = None, jobs: Optional[int] = None) -> bool:
+        """repo.alp'deki tüm repoları tarayıp sıkıştırılmış depo indeksini yaz.
+        
+        output bir dizinse içine index.json.gz yazılır. Aynı yolda önceki bir
+        indeks varsa nesil bir artırılır.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        target = Path(output or RepoIndex.FILENAME).expanduser()
+        if target.is_dir():
+            target = target / RepoIndex.FILENAME
+        repo_content = self.fetch_url(self.repo_list_url())
+        if not repo_content:
+            logger.log("ERROR", "İndeks oluşturulamadı: repo.alp indirilemedi")
+            return False
+        repo_urls = self.parse_repo_list(repo_content)
+        print(f"{Colors.BOLD}{Colors.CYAN}🗂️  Depo indeksi oluşturuluyor: {len(repo_urls)} repo{Colors.ENDC}")
+        
+        def script_digest(repo_url: str, filename: str, branch: str) -> Optional[str]:
+            try:
+                _, body = self._http_get(self.raw_url(repo_url, filename, branch))
+            except Exception as e:
+                logger.log("WARNING", f"Script özeti alınamadı: {repo_url} {filename} - {e}")
+                return None
+            return hashlib.sha256(body).hexdigest() if body is not None else None
+        
+        def entry(repo_url: str) -> Optional[Dict]:
+            _, metadata = self._fetch_repo_entry(repo_url, None, True)
+            if metadata:
+                metadata['script_sha256'] = script_digest(repo_url, 'alp.sh', metadata['branch'])
+                metadata['uninstall_sha256'] = script_digest(repo_url, 'alp_u.sh', metadata['branch'])
+            return metadata
+        
+        workers = max(1, jobs or int(self.config.get("refresh_workers", 8)))
+        with ThreadPoolExecutor(max_workers=min(workers, max(1, len(repo_urls)))) as pool:
+            results = list(pool.map(entry, repo_urls))
+        packages = {}
+        for metadata in results:
+            if metadata:
+                packages[metadata['name']] = metadata
+        
+        try:
+            generation = RepoIndex.generation_of(target.read_bytes()) + 1
+        except OSError:
+            generation = 1
+        index = RepoIndex(packages, generation,
+                          repo_list_sha256=hashlib.sha256(repo_content.encode('utf-8')).hexdigest())
+        blob = index.encode()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.tmp")
+        tmp.write_bytes(blob)
+        os.replace(tmp, target)
+        self.negative_cache.save()
+        logger.log("SUCCESS", f"Depo indeksi yazıldı: {target} ({len(packages)} paket, nesil {generation}, "
+                              f"{len(blob) // 1024} KB, özet {RepoIndex.digest(packages)[:12]})")
+        return True
+    
+    @staticmethod
+    def parse_repo_list(content: str) -> List[str]:
+        """repo.alp içeriğinden yorumsuz, tekrarsız repo URL'lerini sırasıyla çıkar"""
+        repo_urls = []
+        seen = set()
+        for line in content.strip().split('\n'):
+            line = line.strip()
+            if line and not line.startswith('#') and line not in seen:
+                seen.add(line)
+                repo_urls.append(line)
+        return repo_urls
+    
+    def mirror(self, directory: str, jobs: Optional[int] = None) -> bool:
+        """Kataloğun çevrimdışı aynasını dizine oluştur ya da güncelle.
+        
+        repo.alp ve her reponun README.md, alp.sh, alp_u.sh ve cerf.alpc
+        dosyaları raw.githubusercontent.com yol düzeniyle paralel indirilir.
+        İçeriği değişmeyen dosyalara dokunulmaz, kaynakta artık olmayanlar ve
+        repo.alp'den çıkarılan repoların dizinleri silinir; repo.alp en son
+        yazılır. Ayna, mirror_url ayarı dizine
+        (file://) ya da dizini sunan bir HTTP sunucusuna yöneltilerek kullanılır.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        import shutil
+        root = Path(directory).expanduser().resolve()
+        repo_content = self.fetch_url(self.repo_list_url())
+        if not repo_content:
+            logger.log("ERROR", "Ayna oluşturulamadı: repo.alp indirilemedi")
+            return False
+        repo_urls = self.parse_repo_list(repo_content)
+        branches = {pkg['url']: pkg.get('branch') for pkg in self.packages.values() if pkg.get('url')}
+        print(f"{Colors.BOLD}{Colors.CYAN}🪞 Ayna oluşturuluyor: {root} ({len(repo_urls)} repo){Colors.ENDC}")
+        
+        def put(rel: str, body: bytes) -> bool:
+            target = root / rel
+            try:
+                if target.read_bytes() == body:
+                    return False
+            except OSError:
+                pass
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f".{target.name}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, target)
+            return True
+        
+        def snapshot(repo_url: str) -> Dict[str, int]:
+            counts = {"written": 0, "same": 0, "skipped": 0, "failed": 0}
+            readme, branch = self.fetch_readme(repo_url, branches.get(repo_url))
+            if readme is None:
+                # update_repo da README'siz repoları atlar; aynada da yer almaz
+                counts["skipped"] += 1
+                return counts
+            for filename in MIRROR_FILES:
+                rel = self.raw_path(repo_url, filename, branch)
+                if filename == "README.md":
+                    status, body = 200, readme.encode('utf-8')
+                else:
+                    try:
+                        status, body = self._http_get(self.raw_url(repo_url, filename, branch))
+                    except Exception as e:
+                        logger.log("WARNING", f"Aynalanamadı: {rel} - {e}")
+                        counts["failed"] += 1
+                        continue
+                if body is not None:
+                    counts["written" if put(rel, body) else "same"] += 1
+                elif status == 404:
+                    (root / rel).unlink(missing_ok=True)
+                else:
+                    logger.log("WARNING", f"Aynalanamadı: {rel} - HTTP {status}")
+                    counts["failed"] += 1
+            return counts
+        
+        workers = max(1, jobs or int(self.config.get("refresh_workers", 8)))
+        totals = {"written": 0, "same": 0, "skipped": 0, "failed": 0}
+        with ThreadPoolExecutor(max_workers=min(workers, max(1, len(repo_urls)))) as pool:
+            for counts in pool.map(snapshot, repo_urls):
+                for key, value in counts.items():
+                    totals[key] += value
+        # Kaynakta depo indeksi varsa aynaya da konur; istemciler tek istekle yenilenir
+        try:
+            status, blob = self._http_get(self.index_url())
+            if blob is not None:
+                RepoIndex.decode(blob)
+                put(RepoIndex.FILENAME, blob)
+            elif status == 404:
+                (root / RepoIndex.FILENAME).unlink(missing_ok=True)
+        except Exception as e:
+            logger.log("WARNING", f"Depo indeksi aynalanamadı: {e}")
+        # repo.alp'den çıkarılan repoların owner/repo ağaçları silinir
+        listed = {self.raw_path(url, "", "").split("/refs/heads/")[0] for url in repo_urls}
+        pruned = 0
+        for current, dirs, _ in os.walk(root, topdown=True):
+            if "refs" not in dirs:
+                continue
+            dirs.clear()
+            repo_dir = Path(current)
+            if repo_dir.relative_to(root).as_posix() in listed:
+                continue
+            shutil.rmtree(repo_dir, ignore_errors=True)
+            pruned += 1
+            parent = repo_dir.parent
+            while parent != root:
+                try:
+                    parent.rmdir()
+                except OSError:
+                    break
+                parent = parent.parent
+        put("repo.alp", repo_content.encode('utf-8'))
+        self.negative_cache.save()
         
-        self.packages = {}
-        valid_count = 0
+        level = "SUCCESS" if not totals["failed"] else "WARNING"
+        logger.log(level, f"Ayna hazır: {root} (güncellenen: {totals['written']}, aynı: {totals['same']}, "
+                          f"atlanan repo: {totals['skipped']}, silinen repo: {pruned}, başarısız: {totals['failed']}) — kullanmak için: mirror_url = {root.as_uri()}")
+        return not totals["failed"]
+    
+    def _fetch_repo_entry(self, repo_url: str, previous: Optional[Dict] = None,
+                          full: bool = False) -> Tuple[str, Optional[Dict]]:
+        """Tek bir repo için README ve cerf.alpc bilgilerini topla (iş parçacığında çalışır).
         
-        for line in repo_content.strip().split('\n'):
-            line = line.strip()
-            if line and not line.startswith('#'):
-                metadata = self.parse_readme(line)
-                if metadata and 'name' in metadata:
-                    metadata['url'] = line
-                    metadata['added_date'] = datetime.now().isoformat()
-                    # cerf.alpc tara
-                    cert_info = self.parse_cert_alpc(line)
-                    if cert_info:
-                        metadata.update(cert_info)
-                    self.packages[metadata['name']] = metadata
-                    valid_count += 1
+        (durum, metadata) döndürür; durum "added", "changed" veya "unchanged" olur.
+        Parmak izi önceki kayıtla aynıysa metadata yeniden çıkarılmaz. README
+        alınamazsa (zaman aşımı, 5xx, negatif cache) kataloktaki önceki kayıt
+        korunur; paketler yalnızca repo.alp'den çıkarıldıklarında silinir.
+        """
+        state = "changed" if previous else "added"
+        readme, branch = self.fetch_readme(repo_url, (previous or {}).get('branch'))
+        if not readme:
+            if previous:
+                logger.log("WARNING", f"README alınamadı, önceki kayıt korunuyor: {repo_url}")
+                return "unchanged", previous
+            return state, None
+        # cerf.alpc yalnızca README'nin bulunduğu dalda aranır
+        cert_content = self.fetch_cert_alpc(repo_url, branch)
         
-        self.save_packages()
-        logger.log("SUCCESS", f"Depo güncellendi: {valid_count} paket bulundu")
-        return True
+        fingerprint = hashlib.sha256(f"{branch}\0{readme}\0{cert_content or ''}".encode()).hexdigest()
+        if previous and not full and previous.get('fingerprint') == fingerprint:
+            return "unchanged", previous
+        
+        metadata = self.extract_metadata(readme)
+        if 'name' not in metadata:
+            return state, None
+        metadata['url'] = repo_url
+        metadata['branch'] = branch
+        metadata['added_date'] = (previous or {}).get('added_date') or datetime.now().isoformat()
+        metadata['fingerprint'] = fingerprint
+        # cerf.alpc tara
+        cert_info = self.verify_cert_content(cert_content, repo_url)
+        if cert_info:
+            metadata.update(cert_info)
+        return state, metadata
     
     def check_dependencies(self, package_name: str) -> Tuple[bool, List[str]]:
         """Bağımlılıkları kontrol et"""
@@ -795,166 +3257,595 @@ class PackageManager:
         
         return len(missing) == 0, missing
     
-    def resolve_dependencies(self, package_name: str) -> List[str]:
-        """Bağımlılıkları çöz ve kurulum sırasını belirle"""
-        install_order = []
-        visited = set()
+    def _resolve_root(self, package_name: str) -> Tuple[List[str], List[List[str]], Dict[str, List[str]]]:
+        """Tek bir paketin geçişli bağımlılık kapanışını topolojik sırayla çöz.
         
-        def dfs(pkg_name):
-            if pkg_name in visited:
-                return
-            visited.add(pkg_name)
-            
-            if pkg_name in self.packages:
-                deps = self.packages[pkg_name].get('dependencies', [])
-                for dep in deps:
-                    dfs(dep)
-            
-            install_order.append(pkg_name)
+        (sıra, döngüler, bilinmeyenler) döndürür; bilinmeyenler eksik paketi
+        onu isteyen paketlere eşler. Sonuç katalog nesli boyunca cache'lenir.
+        """
+        cached = self._resolve_cache.get(package_name)
+        if cached is not None:
+            return cached
+        
+        order: List[str] = []
+        cycles: List[List[str]] = []
+        unknown: Dict[str, List[str]] = {}
+        state: Dict[str, int] = {}  # 1: ziyaret ediliyor, 2: tamamlandı
+        path: List[str] = []
+        
+        def visit(name: str):
+            state[name] = 1
+            path.append(name)
+            for dep in self.packages.get(name, {}).get('dependencies', []):
+                if dep not in self.packages:
+                    requesters = unknown.setdefault(dep, [])
+                    if name not in requesters:
+                        requesters.append(name)
+                    continue
+                if state.get(dep) == 1:
+                    cycles.append(path[path.index(dep):] + [dep])
+                elif dep not in state:
+                    visit(dep)
+            path.pop()
+            state[name] = 2
+            order.append(name)
+        
+        if package_name in self.packages:
+            visit(package_name)
+        else:
+            unknown[package_name] = []
+        result = (order, cycles, unknown)
+        self._resolve_cache[package_name] = result
+        return result
+    
+    def resolve_install_order(self, package_names: List[str]) -> Tuple[List[str], List[List[str]], Dict[str, List[str]]]:
+        """Birden çok paketin bağımlılıklarını tek seferde çöz.
+        
+        Bağımlılıklar her zaman onlara ihtiyaç duyan paketlerden önce gelir.
+        Zaten yüklü paketler bilinmeyen sayılmaz; yalnızca yüklü paketlerden
+        oluşan döngüler raporlanmaz.
+        """
+        order: List[str] = []
+        seen = set()
+        cycles: List[List[str]] = []
+        unknown: Dict[str, List[str]] = {}
+        for name in package_names:
+            root_order, root_cycles, root_unknown = self._resolve_root(name)
+            for pkg in root_order:
+                if pkg not in seen:
+                    seen.add(pkg)
+                    order.append(pkg)
+            for cycle in root_cycles:
+                if cycle not in cycles and not all(p in self.installed for p in cycle):
+                    cycles.append(cycle)
+            for dep, requesters in root_unknown.items():
+                if dep in self.installed:
+                    continue
+                merged = unknown.setdefault(dep, [])
+                merged.extend(r for r in requesters if r not in merged)
+        return order, cycles, unknown
+    
+    def resolve_dependencies(self, package_name: str) -> List[str]:
+        """Bağımlılıkları çöz ve kurulum sırasını belirle.
         
-        dfs(package_name)
-        return install_order
+        Önceki davranışla uyumlu olarak katalogda olmayan paketler de listede
+        kalır: bilinmeyen paket için [package_name], bilinmeyen bağımlılıklar
+        onları isteyen ilk paketin önünde döner.
+        """
+        if package_name not in self.packages:
+            return [package_name]
+        order, _, unknown = self.resolve_install_order([package_name])
+        for dep, requesters in unknown.items():
+            positions = [order.index(r) for r in requesters if r in order]
+            order.insert(min(positions) if positions else len(order), dep)
+        return order
     
     def install(self, package_name: str, install_deps: bool = True) -> bool:
         """Paket yükle"""
-        if package_name in self.installed:
-            logger.log("WARNING", f"Paket zaten yüklü: {package_name}")
+        if not install_deps:
+            if package_name in self.installed:
+                logger.log("WARNING", f"Paket zaten yüklü: {package_name}")
+                return True
+            if package_name not in self.packages:
+                logger.log("ERROR", f"Paket bulunamadı: {package_name}")
+                return False
+            return self.run_install_plan([package_name])
+        return self.install_many([package_name])
+    
+    def install_many(self, package_names: List[str], as_dependency: bool = False) -> bool:
+        """Birden çok paketi tek bir plan halinde yükle.
+        
+        Tüm istekler birlikte çözülür; döngü ya da bilinmeyen paket varsa hiçbir
+        script çalıştırılmadan hata raporlanır. as_dependency ile kurulan
+        paketler de bağımlılık (auto_installed) olarak işaretlenir.
+        """
+        requested = []
+        promoted = []
+        for name in package_names:
+            if name in self.installed:
+                logger.log("WARNING", f"Paket zaten yüklü: {name}")
+                # Açıkça istenen bağımlılık artık autoremove ile silinmemeli
+                if self.installed[name].get('auto_installed') and not as_dependency:
+                    self.installed[name]['auto_installed'] = False
+                    promoted.append(name)
+            elif name not in requested:
+                requested.append(name)
+        if promoted:
+            self.save_installed(*promoted)
+        if not requested:
             return True
         
-        if package_name not in self.packages:
-            logger.log("ERROR", f"Paket bulunamadı: {package_name}")
-            self.search(package_name)
+        missing = [name for name in requested if name not in self.packages]
+        for name in missing:
+            logger.log("ERROR", f"Paket bulunamadı: {name}")
+            if self.output:
+                # Makine okunur kipte öneriler kayıt akışına karışmaz, stderr'e gider
+                suggestions = [match for _, (match, _, _) in self.search_index.search(name)[:5]]
+                if suggestions:
+                    logger.log("INFO", f"Benzer paketler: {', '.join(suggestions)}")
+            else:
+                self.search(name)
+        if missing:
             return False
         
-        if install_deps:
-            install_order = self.resolve_dependencies(package_name)
-            for pkg in install_order[:-1]:
-                if pkg not in self.installed:
-                    print(f"{Colors.YELLOW}→ Bağımlılık yükleniyor: {pkg}{Colors.ENDC}")
-                    if not self.install(pkg, install_deps=False):
-                        logger.log("ERROR", f"Bağımlılık yüklenemedi: {pkg}")
-                        return False
+        order, cycles, unknown = self.resolve_install_order(requested)
+        for cycle in cycles:
+            logger.log("ERROR", f"Bağımlılık döngüsü: {' → '.join(cycle)}")
+        for dep, requesters in unknown.items():
+            logger.log("ERROR", f"Bilinmeyen bağımlılık: {dep} (isteyen: {', '.join(requesters)})")
+        if cycles or unknown:
+            return False
         
-        pkg = self.packages[package_name]
-        print(f"{Colors.BOLD}{Colors.BLUE}📥 Yükleniyor: {package_name} ({pkg.get('version', 'v?')}){Colors.ENDC}")
+        plan = [pkg for pkg in order if pkg not in self.installed]
+        return self.run_install_plan(plan, requested=set() if as_dependency else set(requested))
+    
+    def run_install_plan(self, plan: List[str], requested: Optional[set] = None,
+                         digests: Optional[Dict[str, str]] = None) -> bool:
+        """Kurulum planını bağımlılık grafiğine göre çalıştır.
         
-        pkg_dir = INSTALLED_DIR / package_name
-        pkg_dir.mkdir(parents=True, exist_ok=True)
+        parallel_install açıksa bağımlılıkları tamamlanmış paketlerin scriptleri
+        install_workers boyutlu bir havuzda aynı anda çalışır; kapalıysa tek
+        işçiyle plan sırası izlenir. Bir paket başarısız olunca yeni iş
+        başlatılmaz ve ona bağlı paketler iptal edilir. Paket çıktıları plan
+        sırasıyla basılır, kurulum kayıtları sonda tek işlemde yazılır. requested
+        dışındaki paketler bağımlılık olarak (auto_installed) işaretlenir.
+        digests önceden depoya alınmış kurulum scriptlerinin özetleridir.
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        if not plan:
+            return True
         
-        base_url = pkg['url'].rstrip('/')
-        if '/tree/main' in base_url:
-            base_url = base_url.replace('/tree/main', '')
+        planned = set(plan)
+        deps_of = {
+            name: [d for d in self.packages.get(name, {}).get('dependencies', []) if d in planned and d != name]
+            for name in plan
+        }
+        dependents = {name: [] for name in plan}
+        for name, deps in deps_of.items():
+            for dep in deps:
+                dependents[dep].append(name)
         
-        raw_url = base_url.replace('github.com', 'raw.githubusercontent.com') + '/refs/heads/main/alp.sh'
-        script_path = ALP_CACHE / f"{package_name}_install.sh"
+        workers = 1
+        if self.config.get("parallel_install", False):
+            workers = max(1, int(self.config.get("install_workers", 4)))
+        if len(plan) > 1:
+            print(f"{Colors.YELLOW}→ Kurulum planı ({workers} işçi): {' → '.join(plan)}{Colors.ENDC}")
         
-        logger.log("INFO", f"Kurulum scripti indiriliyor: {raw_url}")
+        done, failed, cancelled = set(), set(), set()
+        results: Dict[str, Tuple[bool, Optional[Dict], List[Tuple[str, str]]]] = {}
+        pending = list(plan)
+        running = {}
         
-        if not self.download_file(raw_url, script_path):
-            logger.log("ERROR", f"Kurulum scripti indirilemedi: {package_name}")
-            return False
+        def cancel_dependents(name: str):
+            for child in dependents[name]:
+                if child not in cancelled:
+                    cancelled.add(child)
+                    cancel_dependents(child)
         
-        try:
-            os.chmod(script_path, 0o755)
-            result = subprocess.run(
-                [str(script_path)],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending or running:
+                if not failed:
+                    for name in list(pending):
+                        if len(running) >= workers:
+                            break
+                        if all(dep in done for dep in deps_of[name]):
+                            pending.remove(name)
+                            running[pool.submit(self._install_one, name, workers == 1,
+                                                (digests or {}).get(name))] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        results[name] = (False, None, [("ERROR", f"Kurulum hatası: {e}")])
+                    if results[name][0]:
+                        done.add(name)
+                        print(f"  {Colors.GREEN}✓{Colors.ENDC} {name}")
+                    else:
+                        failed.add(name)
+                        cancel_dependents(name)
+                        print(f"  {Colors.RED}✗{Colors.ENDC} {name}")
+        # Hata sonrası hiç başlatılmayan bağımsız paketler iptallerden ayrı tutulur
+        not_started = [name for name in pending if name not in cancelled]
+        
+        # Paket bazlı loglar plan sırasıyla
+        for name in plan:
+            if name in results:
+                for level, message in results[name][2]:
+                    logger.log(level, message)
+            elif name in cancelled:
+                logger.log("WARNING", f"{name} kurulmadı (bağımlılık hatası nedeniyle iptal)")
+            elif name in not_started:
+                logger.log("WARNING", f"{name} kurulmadı (başka bir paketin hatası nedeniyle başlatılmadı)")
+        
+        for name in plan:
+            if name in done:
+                install_info = results[name][1]
+                install_info['auto_installed'] = requested is not None and name not in requested
+                install_info['disk_usage'] = self._measure_disk_usage(name)
+                self.installed[name] = install_info
+                self.reverse_deps.add(name, install_info.get('dependencies', []))
+        if done:
+            self.save_installed(*[name for name in plan if name in done])
+            self.reverse_deps.save()
+        return not failed and not cancelled and not not_started
+    
+    def _install_one(self, package_name: str, show_progress: bool = True,
+                     script_digest: Optional[str] = None) -> Tuple[bool, Optional[Dict], List[Tuple[str, str]]]:
+        """Tek bir paketin kurulum scriptini indirip çalıştır (iş parçacığında çalışır).
+        
+        script_digest önceden depoya alınmış scriptin özetidir; verilirse
+        indirme yapılmaz. Veritabanına dokunmaz; (başarı, kurulum kaydı,
+        [(seviye, mesaj)]) döndürür.
+        """
+        import subprocess
+        log = []
+        pkg = self.packages.get(package_name)
+        if not pkg:
+            log.append(("ERROR", f"Paket bulunamadı: {package_name}"))
+            return False, None, log
+        log.append(("INFO", f"Yükleniyor: {package_name} ({pkg.get('version', 'v?')})"))
+        
+        raw_url = self.raw_url(pkg['url'], 'alp.sh', pkg.get('branch') or 'main')
+        
+        log.append(("INFO", f"Kurulum scripti indiriliyor: {raw_url}"))
+        
+        script_checksum = self.fetch_object(raw_url, f"{package_name}/alp.sh", show_progress=show_progress,
+                                            expected_sha256=script_digest or pkg.get('script_sha256'), log=log)
+        if not script_checksum:
+            log.append(("ERROR", f"Kurulum scripti indirilemedi: {package_name}"))
+            return False, None, log
+        script_path = self.objects.path(script_checksum)
+        
+        # Script çalışması bitene kadar LRU temizliğinden korunur
+        with self.cache.pin(script_path):
+            try:
+                result = subprocess.run(
+                    [str(script_path)],
+                    capture_output=True,
+                    text=True,
+                    timeout=300
+                )
             
-            if result.returncode == 0:
-                install_info = {
-                    **pkg,
-                    'installed_at': datetime.now().isoformat(),
-                    'checksum': self.calculate_checksum(script_path)
-                }
-                with open(pkg_dir / "installed.json", 'w') as f:
-                    json.dump(install_info, f, indent=2)
+                if result.returncode == 0:
+                    install_info = {
+                        **pkg,
+                        'installed_at': datetime.now().isoformat(),
+                        'checksum': script_checksum
+                    }
+                    pkg_dir = INSTALLED_DIR / package_name
+                    pkg_dir.mkdir(parents=True, exist_ok=True)
+                    with open(pkg_dir / "installed.json", 'w') as f:
+                        json.dump(install_info, f, indent=2)
                 
-                self.installed[package_name] = install_info
-                self.save_installed()
-                logger.log("SUCCESS", f"{package_name} başarıyla yüklendi")
-                return True
-            else:
-                logger.log("ERROR", f"Kurulum başarısız: {result.stderr}")
-                return False
-        except subprocess.TimeoutExpired:
-            logger.log("ERROR", f"Kurulum zaman aşımı: {package_name}")
-            return False
-        except Exception as e:
-            logger.log("ERROR", f"Kurulum hatası: {e}")
-            return False
+                    log.append(("SUCCESS", f"{package_name} başarıyla yüklendi"))
+                    return True, install_info, log
+                else:
+                    log.append(("ERROR", f"Kurulum başarısız: {package_name}: {result.stderr}"))
+                    return False, None, log
+            except subprocess.TimeoutExpired:
+                log.append(("ERROR", f"Kurulum zaman aşımı: {package_name}"))
+                return False, None, log
+            except Exception as e:
+                log.append(("ERROR", f"Kurulum hatası: {e}"))
+                return False, None, log
     
-    def remove(self, package_name: str, remove_deps: bool = False) -> bool:
-        """Paket kaldır"""
+    def remove(self, package_name: str, remove_deps: bool = False, force: bool = False) -> bool:
+        """Paket kaldır.
+        
+        Başka yüklü paketler bu pakete bağlıysa force verilmedikçe kaldırma
+        reddedilir. remove_deps ile paketin artık kimsenin kullanmadığı,
+        bağımlılık olarak kurulmuş bağımlılıkları da kaldırılır.
+        """
+        import shutil
         pkg_dir = INSTALLED_DIR / package_name
         
         if not pkg_dir.exists():
             logger.log("ERROR", f"Paket yüklü değil: {package_name}")
             return False
         
+        users = [u for u in self.reverse_deps.dependents(package_name) if u in self.installed]
+        if users:
+            if not force:
+                logger.log("ERROR", f"{package_name} şu paketler tarafından kullanılıyor: {', '.join(users)} "
+                                    f"(yine de kaldırmak için --force)")
+                return False
+            logger.log("WARNING", f"{package_name} kaldırılıyor, bağımlı paketler bozulabilir: {', '.join(users)}")
+        
+        deps = self.installed.get(package_name, {}).get('dependencies', [])
+        
         print(f"{Colors.BOLD}{Colors.RED}🗑️  Kaldırılıyor: {package_name}{Colors.ENDC}")
         
         if package_name in self.packages:
-            pkg = self.packages[package_name]
-            
-            base_url = pkg['url'].rstrip('/')
-            if '/tree/main' in base_url:
-                base_url = base_url.replace('/tree/main', '')
-            
-            raw_url = base_url.replace('github.com', 'raw.githubusercontent.com') + '/refs/heads/main/alp_u.sh'
-            uninstall_path = ALP_CACHE / f"{package_name}_uninstall.sh"
-            
-            if self.download_file(raw_url, uninstall_path):
-                try:
-                    os.chmod(uninstall_path, 0o755)
-                    result = subprocess.run(
-                        [str(uninstall_path)],
-                        capture_output=True,
-                        text=True,
-                        timeout=300
-                    )
-                    if result.returncode != 0:
-                        logger.log("WARNING", f"Kaldırma scripti hata verdi: {result.stderr}")
-                except Exception as e:
-                    logger.log("WARNING", f"Kaldırma scripti çalıştırılamadı: {e}")
+            self._run_script(self.fetch_uninstall(package_name), "Kaldırma scripti")
         
         shutil.rmtree(pkg_dir, ignore_errors=True)
         
         if package_name in self.installed:
             del self.installed[package_name]
-            self.save_installed()
+            self.save_installed(package_name)
+        self.reverse_deps.discard(package_name)
+        self.reverse_deps.save()
         
         logger.log("SUCCESS", f"{package_name} kaldırıldı")
+        if remove_deps and deps:
+            self.autoremove(candidates=deps)
         return True
     
-    def upgrade(self, package_name: Optional[str] = None) -> bool:
-        """Paket güncelle"""
-        if package_name:
-            if package_name not in self.installed:
-                logger.log("ERROR", f"Paket yüklü değil: {package_name}")
+    def fetch_uninstall(self, package_name: str) -> Optional[str]:
+        """Katalogdaki paketin kaldırma scriptini (alp_u.sh) depoya al; özetini döndür"""
+        pkg = self.packages[package_name]
+        raw_url = self.raw_url(pkg['url'], 'alp_u.sh', pkg.get('branch') or 'main')
+        return self.fetch_object(raw_url, f"{package_name}/alp_u.sh", show_progress=False,
+                                 expected_sha256=pkg.get('uninstall_sha256'))
+    
+    def _run_script(self, digest: Optional[str], what: str) -> bool:
+        """Depodaki scripti çalıştır; hata verirse uyarı logla ve False döndür"""
+        import subprocess
+        if not digest:
+            return False
+        path = self.objects.path(digest)
+        with self.cache.pin(path):
+            try:
+                result = subprocess.run([str(path)], capture_output=True, text=True, timeout=300)
+            except Exception as e:
+                logger.log("WARNING", f"{what} çalıştırılamadı: {e}")
                 return False
-            packages_to_upgrade = [package_name]
-        else:
-            packages_to_upgrade = list(self.installed.keys())
+        if result.returncode != 0:
+            logger.log("WARNING", f"{what} hata verdi: {result.stderr}")
+            return False
+        return True
+    
+    def find_orphans(self, candidates: Optional[List[str]] = None) -> List[str]:
+        """Kaldırılabilecek yetim bağımlılıkları, bağımlılar önce gelecek sırayla bul.
+        
+        Yetim: bağımlılık olarak kurulmuş ve hiçbir yüklü paketin ihtiyaç
+        duymadığı paket. Bir yetimin kaldırılması kendi bağımlılıklarını da
+        yetim bırakabileceği için işlem sabit noktaya kadar tekrarlanır.
+        """
+        remaining = set(self.installed)
+        order = []
+        frontier = set(candidates) if candidates is not None else set(self.installed)
+        while frontier:
+            next_frontier = set()
+            for name in sorted(frontier):
+                info = self.installed.get(name)
+                if name not in remaining or not info or not info.get('auto_installed'):
+                    continue
+                if any(u in remaining for u in self.reverse_deps.dependents(name)):
+                    continue
+                remaining.discard(name)
+                order.append(name)
+                next_frontier.update(info.get('dependencies', []))
+            frontier = next_frontier
+        return order
+    
+    def autoremove(self, candidates: Optional[List[str]] = None) -> bool:
+        """Artık kullanılmayan, bağımlılık olarak kurulmuş paketleri kaldır"""
+        orphans = self.find_orphans(candidates)
+        if not orphans:
+            if candidates is None:
+                logger.log("INFO", "Kaldırılacak yetim bağımlılık yok")
+            return True
+        print(f"{Colors.YELLOW}→ Yetim bağımlılıklar: {', '.join(orphans)}{Colors.ENDC}")
+        ok = True
+        for name in orphans:
+            ok = self.remove(name) and ok
+        return ok
+    
+    def outdated_packages(self, names: Optional[List[str]] = None) -> List[Tuple[str, str, str]]:
+        """Yerel katalogda daha yeni sürümü olan yüklü paketler: [(ad, yüklü, mevcut)]; ağ kullanılmaz"""
+        result = []
+        for name in sorted(self.installed if names is None else names):
+            info = self.installed.get(name)
+            pkg = self.packages.get(name)
+            if not info or not pkg:
+                continue
+            installed_ver = info.get('version', '0')
+            available_ver = pkg.get('version', '0')
+            if self.compare_versions(available_ver, installed_ver) > 0:
+                result.append((name, installed_ver, available_ver))
+        return result
+    
+    def outdated(self) -> bool:
+        """Güncellenebilir paketleri yerel katalogdan listele (ağ bağlantısı gerektirmez)"""
+        rows = self.outdated_packages()
+        if self.output:
+            self.output.records({
+                "name": name,
+                "installed_version": installed_ver,
+                "available_version": available_ver,
+                "auto_installed": bool(self.installed[name].get('auto_installed')),
+            } for name, installed_ver, available_ver in rows)
+            return True
+        
+        catalog_date = (datetime.fromtimestamp(PACKAGES_DB.stat().st_mtime).strftime('%Y-%m-%d %H:%M')
+                        if PACKAGES_DB.exists() else None)
+        if not rows:
+            logger.log("INFO", f"Tüm paketler güncel (katalog: {catalog_date or 'yok'})")
+            return True
+        
+        print(f"\n{Colors.BOLD}{Colors.YELLOW}🔄 Güncellenebilir Paketler ({len(rows)}):{Colors.ENDC}")
+        print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
+        for name, installed_ver, available_ver in rows:
+            print(f"{Colors.YELLOW}↑{Colors.ENDC} {Colors.BOLD}{name:24}{Colors.ENDC} {installed_ver:>10} → {Colors.GREEN}{available_ver}{Colors.ENDC}")
+        print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
+        print(f"Katalog: {catalog_date or 'yok'} — yenilemek için 'alp update', uygulamak için 'alp upgrade'\n")
+        return True
+    
+    def upgrade(self, package_name: Optional[str] = None) -> bool:
+        """Paketleri önce planlayıp sonra uygulayarak güncelle.
+        
+        1. Plan: yerel katalogda daha yeni sürümü olan paketler ve yeni
+           sürümlerin istediği eksik bağımlılıklar bağımlılık sırasıyla
+           çözülür; döngü ya da bilinmeyen bağımlılık varsa hiçbir şeye
+           dokunulmaz.
+        2. Ön indirme: tüm yeni alp.sh ve alp_u.sh scriptleri paralel olarak
+           içerik adresli depoya alınır. Bir kurulum ya da kaldırma scripti
+           alınamazsa sistem değiştirilmeden durulur; bu aşamada kesinti
+           güvenlidir. Depoda hiç alp_u.sh olmayan (404) paketler uyarıyla
+           kaldırma scripti çalıştırılmadan güncellenir.
+        3. Uygulama: paketler sırayla kaldırılıp yeni sürümle kurulur. Eski
+           kayıt ve eski kurulum scripti (depoda özetiyle) yeni sürüm
+           kurulana kadar saklanır; kurulum başarısız olur ya da kesilirse
+           eski script yeniden çalıştırılıp eski kayıt korunur.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        import http.client
+        if package_name and package_name not in self.installed:
+            logger.log("ERROR", f"Paket yüklü değil: {package_name}")
+            return False
         
         print(f"{Colors.BOLD}{Colors.YELLOW}🔄 Güncellemeler kontrol ediliyor...{Colors.ENDC}")
+        outdated = {name: (old, new) for name, old, new in
+                    self.outdated_packages([package_name] if package_name else None)}
+        if not outdated:
+            logger.log("SUCCESS", "0 paket güncellendi")
+            return True
         
-        updated_count = 0
-        for pkg_name in packages_to_upgrade:
-            if pkg_name not in self.packages:
+        # 1. Plan
+        order, cycles, unknown = self.resolve_install_order(sorted(outdated))
+        for cycle in cycles:
+            logger.log("ERROR", f"Bağımlılık döngüsü: {' → '.join(cycle)}")
+        for dep, requesters in unknown.items():
+            logger.log("ERROR", f"Bilinmeyen bağımlılık: {dep} (isteyen: {', '.join(requesters)})")
+        if cycles or unknown:
+            return False
+        plan = [name for name in order if name in outdated or name not in self.installed]
+        print(f"{Colors.YELLOW}→ Güncelleme planı: " + ", ".join(
+            f"{name} {outdated[name][0]} → {outdated[name][1]}" if name in outdated else f"{name} (yeni bağımlılık)"
+            for name in plan) + f"{Colors.ENDC}")
+        
+        # 2. Ön indirme
+        def prefetch(name: str) -> Tuple[str, Optional[str], Optional[str], bool]:
+            pkg = self.packages[name]
+            branch = pkg.get('branch') or 'main'
+            script = self.fetch_object(self.raw_url(pkg['url'], 'alp.sh', branch),
+                                       f"{name}/alp.sh", show_progress=False,
+                                       expected_sha256=pkg.get('script_sha256'))
+            if name not in outdated:
+                return name, script, None, True
+            uninstall = self.fetch_uninstall(name)
+            absent = False
+            if not uninstall:
+                # Yalnızca depoda gerçekten olmayan alp_u.sh kabul edilir; ağ ve sunucu hataları durdurur
+                try:
+                    absent = self.http.request('GET', self.raw_url(pkg['url'], 'alp_u.sh', branch))[0] == 404
+                except (OSError, http.client.HTTPException):
+                    absent = False
+            return name, script, uninstall, bool(uninstall) or absent
+        
+        workers = max(1, int(self.config.get("refresh_workers", 8)))
+        with ThreadPoolExecutor(max_workers=min(workers, len(plan))) as pool:
+            results = list(pool.map(prefetch, plan))
+        fetched = {name: (script, uninstall) for name, script, uninstall, _ in results}
+        missing = [name for name, script, _, _ in results if not script]
+        if missing:
+            logger.log("ERROR", f"Kurulum scriptleri indirilemedi, hiçbir paket değiştirilmedi: {', '.join(missing)}")
+            return False
+        unfetched = [name for name, _, _, ok in results if not ok]
+        if unfetched:
+            logger.log("ERROR", f"Kaldırma scriptleri indirilemedi, hiçbir paket değiştirilmedi: {', '.join(unfetched)}")
+            return False
+        no_uninstall = [name for name in outdated if not fetched[name][1]]
+        if no_uninstall:
+            logger.log("WARNING", f"Depoda alp_u.sh yok, kaldırma scripti çalıştırılmadan güncellenecek: {', '.join(no_uninstall)}")
+        no_rollback = [name for name in outdated
+                       if not self.installed[name].get('checksum')
+                       or not self.objects.path(self.installed[name]['checksum']).is_file()]
+        if no_rollback:
+            logger.log("WARNING", f"Eski kurulum scripti depoda yok, hata olursa geri alınamaz: {', '.join(no_rollback)}")
+        
+        # 3. Uygulama
+        updated, failed = [], []
+        for name in plan:
+            if any(dep in failed for dep in self.packages[name].get('dependencies', [])):
+                logger.log("WARNING", f"{name} güncellenmedi (bağımlılık hatası nedeniyle iptal)")
+                failed.append(name)
                 continue
-            
-            installed_ver = self.installed[pkg_name].get('version', '0')
-            available_ver = self.packages[pkg_name].get('version', '0')
-            
-            if self.compare_versions(available_ver, installed_ver) > 0:
-                print(f"{Colors.YELLOW}→ Güncelleniyor: {pkg_name} {installed_ver} → {available_ver}{Colors.ENDC}")
-                if self.remove(pkg_name) and self.install(pkg_name):
-                    updated_count += 1
+            if name not in outdated:
+                ok = self.run_install_plan([name], requested=set(), digests={name: fetched[name][0]})
+            else:
+                print(f"{Colors.YELLOW}→ Güncelleniyor: {name} {outdated[name][0]} → {outdated[name][1]}{Colors.ENDC}")
+                ok = self._upgrade_one(name, *fetched[name])
+            (updated if ok else failed).append(name)
+        
+        upgraded = [name for name in updated if name in outdated]
+        if failed:
+            logger.log("ERROR", f"{len(upgraded)} paket güncellendi, başarısız: {', '.join(failed)}")
+            return False
+        logger.log("SUCCESS", f"{len(upgraded)} paket güncellendi")
+        return True
+    
+    def _upgrade_one(self, name: str, script_digest: str, uninstall_digest: Optional[str]) -> bool:
+        """Yüklü paketi önceden alınmış scriptlerle yeni sürüme geçir; başarısızsa eski sürüme dön"""
+        import shutil
+        old = dict(self.installed[name])
+        old_script = self.objects.path(old['checksum']) if old.get('checksum') else None
+        
+        def rollback() -> None:
+            if old_script and old_script.is_file() and self._run_script(old['checksum'], "Eski kurulum scripti"):
+                pkg_dir = INSTALLED_DIR / name
+                pkg_dir.mkdir(parents=True, exist_ok=True)
+                with open(pkg_dir / "installed.json", 'w') as f:
+                    json.dump({k: v for k, v in old.items() if k != 'disk_usage'}, f, indent=2)
+                logger.log("WARNING", f"{name} eski sürüme ({old.get('version', '?')}) geri alındı")
+                return
+            # Eski sürüm yeniden kurulamadı: kayıt gerçeği yansıtsın (kaldırma scripti zaten çalıştı)
+            logger.log("ERROR", f"{name} eski sürüme geri alınamadı, paket kaldırılmış durumda")
+            shutil.rmtree(INSTALLED_DIR / name, ignore_errors=True)
+            self.installed.pop(name, None)
+            self.save_installed(name)
+            self.reverse_deps.discard(name)
+            self.reverse_deps.save()
+        
+        # Eski kurulum scripti geri alma gerekebileceği için iş bitene kadar cache'te tutulur
+        with self.cache.pin(old_script) if old_script else contextlib.nullcontext():
+            try:
+                if uninstall_digest:
+                    self._run_script(uninstall_digest, "Kaldırma scripti")
+                # remove() gibi paket dizini temizlenir; yeni (ya da geri alınan) kurulum temiz dizinle başlar
+                shutil.rmtree(INSTALLED_DIR / name, ignore_errors=True)
+                ok, install_info, log = self._install_one(name, show_progress=False, script_digest=script_digest)
+            except BaseException:
+                rollback()
+                raise
+            for level, message in log:
+                logger.log(level, message)
+            if not ok:
+                rollback()
+                return False
         
-        logger.log("SUCCESS", f"{updated_count} paket güncellendi")
+        install_info['auto_installed'] = bool(old.get('auto_installed'))
+        install_info['disk_usage'] = self._measure_disk_usage(name)
+        self.installed[name] = install_info
+        self.reverse_deps.discard(name)
+        self.reverse_deps.add(name, install_info.get('dependencies', []))
+        self.save_installed(name)
+        self.reverse_deps.save()
         return True
     
     def compare_versions(self, v1: str, v2: str) -> int:
@@ -972,17 +3863,37 @@ class PackageManager:
         except:
             return 0
     
-    def list_packages(self, category: Optional[str] = None) -> None:
+    def _package_record(self, name: str, pkg: Dict) -> Dict:
+        """Katalog kaydının makine okunur özeti"""
+        return {
+            "name": name,
+            "version": pkg.get('version'),
+            "description": pkg.get('description'),
+            "author": pkg.get('author'),
+            "license": pkg.get('license'),
+            "category": pkg.get('category', 'misc'),
+            "url": pkg.get('url'),
+            "dependencies": pkg.get('dependencies', []),
+            "cert_type": pkg.get('cert_type'),
+            "cert_valid": bool(pkg.get('cert_valid')),
+            "installed": name in self.installed,
+        }
+    
+    def list_packages(self, category: Optional[str] = None) -> bool:
         """Paketleri listele"""
         if not self.packages:
             logger.log("ERROR", "Paket bulunamadı. 'alp update' çalıştırın")
-            return
+            return False
         
         packages_to_show = self.packages
         if category:
             packages_to_show = {k: v for k, v in self.packages.items() 
                                if v.get('category') == category}
         
+        if self.output:
+            self.output.records(self._package_record(name, pkg) for name, pkg in sorted(packages_to_show.items()))
+            return True
+        
         print(f"\n{Colors.BOLD}{Colors.CYAN}📦 Mevcut Paketler:{Colors.ENDC}")
         print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
         
@@ -990,7 +3901,7 @@ class PackageManager:
             ver = pkg.get('version', '?')
             des = pkg.get('description', 'Açıklama yok')[:50]
             cat = pkg.get('category', 'misc')
-            status = "✅" if (INSTALLED_DIR / name).exists() else "⭕"
+            status = "✅" if name in self.installed else "⭕"
             # Sertifika rozetleri
             cert_icon = ""
             if pkg.get('cert_type') and pkg.get('cert_valid'):
@@ -1005,14 +3916,81 @@ class PackageManager:
             print(f"   └─ {des}...")
         
         print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
-        installed_count = len([k for k in self.packages.keys() if (INSTALLED_DIR / k).exists()])
+        installed_count = len([k for k in packages_to_show if k in self.installed])
         print(f"{Colors.GREEN}✅ Yüklü: {installed_count}/{len(packages_to_show)}{Colors.ENDC}\n")
+        return True
+    
+    @staticmethod
+    def _measure_disk_usage(name: str) -> Dict[str, int]:
+        """Paket dizinini bir kez dolaşıp boyut ve dosya sayısını ölç"""
+        pkg_dir = INSTALLED_DIR / name
+        size = files = 0
+        stack = [str(pkg_dir)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        size += entry.stat(follow_symlinks=False).st_size
+                        files += 1
+        try:
+            mtime = pkg_dir.stat().st_mtime_ns
+        except OSError:
+            mtime = 0
+        return {"size_bytes": size, "file_count": files, "dir_mtime_ns": mtime}
+    
+    def disk_usage(self, recompute: bool = False) -> Dict[str, Dict[str, int]]:
+        """Yüklü paketlerin kayıtlı disk kullanımı.
+        
+        Kurulumda ölçülen değerler, paket dizininin mtime'ı değişmedikçe
+        dosya sistemi dolaşılmadan kullanılır; değişenler yeniden ölçülüp
+        kayda yazılır. recompute tümünü yeniden ölçer.
+        """
+        usage = {}
+        stale = []
+        for name, info in self.installed.items():
+            recorded = info.get('disk_usage')
+            if not recompute and recorded:
+                try:
+                    mtime = (INSTALLED_DIR / name).stat().st_mtime_ns
+                except OSError:
+                    mtime = 0
+                if mtime == recorded.get('dir_mtime_ns'):
+                    usage[name] = recorded
+                    continue
+            info['disk_usage'] = usage[name] = self._measure_disk_usage(name)
+            if info['disk_usage'] != recorded:
+                stale.append(name)
+        if stale:
+            self.save_installed(*stale)
+        return usage
     
-    def list_installed(self) -> None:
+    def list_installed(self, recompute: bool = False) -> bool:
         """Yüklü paketleri listele"""
+        usage = self.disk_usage(recompute)
+        if self.output:
+            self.output.records({
+                "name": name,
+                "version": info.get('version'),
+                "installed_at": info.get('installed_at'),
+                "size_bytes": usage[name]["size_bytes"],
+                "file_count": usage[name]["file_count"],
+                "source": info.get('source', 'repo'),
+                "auto_installed": bool(info.get('auto_installed')),
+                "certified": bool(info.get('certified')),
+                "cert_type": info.get('cert_type'),
+                "dependencies": info.get('dependencies', []),
+            } for name, info in sorted(self.installed.items()))
+            return True
+        
         if not self.installed:
             logger.log("INFO", "Hiçbir paket yüklü değil")
-            return
+            return True
         
         print(f"\n{Colors.BOLD}{Colors.GREEN}✅ Yüklü Paketler:{Colors.ENDC}")
         print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
@@ -1020,7 +3998,7 @@ class PackageManager:
         for name, info in sorted(self.installed.items()):
             ver = info.get('version', '?')
             installed_at = info.get('installed_at', '?')
-            size = sum(f.stat().st_size for f in (INSTALLED_DIR / name).rglob('*') if f.is_file()) / 1024 / 1024
+            size = usage[name]["size_bytes"] / 1024 / 1024
             
             # Sertifika durumu
             cert_icon = ""
@@ -1034,37 +4012,68 @@ class PackageManager:
             print(f"   └─ Yükleme tarihi: {installed_at[:10]}")
         
         print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}\n")
+        return True
     
-    def search(self, keyword: str) -> None:
-        """Paket ara"""
-        results = {name: pkg for name, pkg in self.packages.items() 
-                   if keyword.lower() in name.lower() or 
-                   keyword.lower() in pkg.get('description', '').lower()}
+    @component_property
+    def search_index(self) -> SearchIndex:
+        """Arama indeksi; packages.json'dan eskiyse yeniden kurulur"""
+        index = SearchIndex.load()
+        if index is None:
+            index = SearchIndex.build(self.packages)
+            if PACKAGES_DB.exists():
+                index.save()
+        return index
+    
+    def search(self, keyword: str) -> bool:
+        """Paket ara.
+        
+        Birden çok terim desteklenir (hepsi eşleşmeli); author:, category: ve
+        license: ile filtrelenir. Sonuçlar alaka sırasıyla listelenir.
+        """
+        results = self.search_index.search(keyword)
+        
+        if self.output:
+            self.output.records({"name": name, "version": ver, "description": des, "score": score,
+                                 "installed": name in self.installed}
+                                for score, (name, ver, des) in results)
+            return bool(results)
         
         if not results:
             logger.log("ERROR", f"'{keyword}' ile eşleşen paket bulunamadı")
-            return
+            return False
         
         print(f"\n{Colors.BOLD}{Colors.CYAN}🔍 '{keyword}' için arama sonuçları:{Colors.ENDC}")
         print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
         
-        for name, pkg in sorted(results.items()):
-            ver = pkg.get('version', '?')
-            des = pkg.get('description', 'Açıklama yok')[:60]
-            status = "✅" if (INSTALLED_DIR / name).exists() else "⭕"
+        for _, (name, ver, des) in results:
+            des = des or 'Açıklama yok'
+            status = "✅" if name in self.installed else "⭕"
             
             print(f"{status} {Colors.BOLD}{name}{Colors.ENDC:24} {ver:8} - {des}")
         
         print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}\n")
+        return True
     
-    def show_info(self, package_name: str) -> None:
+    def show_info(self, package_name: str) -> bool:
         """Paket detaylarını göster"""
         if package_name not in self.packages:
             logger.log("ERROR", f"Paket bulunamadı: {package_name}")
-            return
+            return False
         
         pkg = self.packages[package_name]
-        is_installed = (INSTALLED_DIR / package_name).exists()
+        is_installed = package_name in self.installed
+        
+        if self.output:
+            record = self._package_record(package_name, pkg)
+            record.update({
+                "main": pkg.get('main'),
+                "missing_dependencies": [dep for dep in pkg.get('dependencies', []) if dep not in self.installed],
+                "dependents": [u for u in self.reverse_deps.dependents(package_name) if u in self.installed],
+                "cert_author": pkg.get('cert_author'),
+                "certificate": self.cert_manager.get_certificate(package_name) if is_installed else None,
+            })
+            self.output.record(record)
+            return True
         
         print(f"\n{Colors.BOLD}{Colors.CYAN}📋 {package_name}{Colors.ENDC}")
         print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
@@ -1086,6 +4095,10 @@ class PackageManager:
                 status = f"{Colors.GREEN}✓{Colors.ENDC}" if dep in self.installed else f"{Colors.RED}✗{Colors.ENDC}"
                 print(f"    {status} {dep}")
         
+        users = [u for u in self.reverse_deps.dependents(package_name) if u in self.installed]
+        if users:
+            print(f"  {Colors.BOLD}Bağımlı Paketler:{Colors.ENDC} {', '.join(users)}")
+        
         # Repo sertifikası (cerf.alpc)
         if pkg.get('cert_type'):
             icon = "🏆" if pkg.get('cert_type') == 'official' else ("🔧" if pkg.get('cert_type') == 'dev' else "👤")
@@ -1106,44 +4119,183 @@ class PackageManager:
                 print(f"  {Colors.BOLD}Sertifika:{Colors.ENDC} {Colors.YELLOW}Yok ⚠️{Colors.ENDC}")
         
         print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}\n")
+        return True
     
     def clean_cache(self) -> None:
         """Cache'i temizle"""
+        import shutil
         if ALP_CACHE.exists():
             shutil.rmtree(ALP_CACHE)
             ALP_CACHE.mkdir()
+            self.cache.reset()
+            self.objects.reset()
             logger.log("SUCCESS", "Cache temizlendi")
     
-    def stats(self) -> None:
+    def stats(self, recompute: bool = False) -> bool:
         """İstatistikleri göster"""
-        total_size = 0
-        for pkg_dir in INSTALLED_DIR.glob("*"):
-            if pkg_dir.is_dir():
-                total_size += sum(f.stat().st_size for f in pkg_dir.rglob("*") if f.is_file())
+        usage = self.disk_usage(recompute)
+        total_size = sum(u["size_bytes"] for u in usage.values())
+        total_files = sum(u["file_count"] for u in usage.values())
         
         # Sertifika istatistikleri
         certified_count = sum(1 for info in self.installed.values() if info.get('certified'))
         official_count = sum(1 for info in self.installed.values() if info.get('cert_type') == 'official')
+        last_update = datetime.fromtimestamp(PACKAGES_DB.stat().st_mtime) if PACKAGES_DB.exists() else None
+        
+        if self.output:
+            self.output.record({
+                "total_packages": len(self.packages),
+                "installed_packages": len(self.installed),
+                "certified_packages": certified_count,
+                "official_packages": official_count,
+                "disk_usage_bytes": total_size,
+                "file_count": total_files,
+                "alp_home": str(ALP_HOME),
+                "last_update": last_update.isoformat() if last_update else None,
+            })
+            return True
         
         print(f"\n{Colors.BOLD}{Colors.CYAN}📊 Alp İstatistikleri:{Colors.ENDC}")
         print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
         print(f"  {Colors.BOLD}Toplam Paket:{Colors.ENDC} {len(self.packages)}")
         print(f"  {Colors.BOLD}Yüklü Paket:{Colors.ENDC} {len(self.installed)}")
         print(f"  {Colors.BOLD}Sertifikalı Paket:{Colors.ENDC} {certified_count} ({Colors.GREEN}🏆 Official: {official_count}{Colors.ENDC})")
-        print(f"  {Colors.BOLD}Kullanılan Alan:{Colors.ENDC} {total_size / 1024 / 1024:.2f} MB")
+        print(f"  {Colors.BOLD}Kullanılan Alan:{Colors.ENDC} {total_size / 1024 / 1024:.2f} MB ({total_files} dosya)")
         print(f"  {Colors.BOLD}Alp Dizini:{Colors.ENDC} {ALP_HOME}")
-        print(f"  {Colors.BOLD}Son Güncelleme:{Colors.ENDC} {datetime.fromtimestamp(PACKAGES_DB.stat().st_mtime) if PACKAGES_DB.exists() else 'Hiç'}")
+        print(f"  {Colors.BOLD}Son Güncelleme:{Colors.ENDC} {last_update or 'Hiç'}")
         print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}\n")
+        return True
     
-    def doctor(self) -> None:
-        """Sistem sağlığını kontrol et: bozuk kurulumlar, eksik bağımlılıklar, cache sorunları"""
-        print(f"\n{Colors.BOLD}{Colors.CYAN}🏥 Alp Doktor:{Colors.ENDC}")
-        print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
+    def _doctor_fingerprint(self, name: str) -> str:
+        """Paket dizini, installed.json, kayıt ve ilgili dosyaların stat'ından parmak izi"""
+        def stamp(path: Path):
+            try:
+                st = path.stat()
+            except OSError:
+                return None
+            return [st.st_mtime_ns, st.st_size]
+        info = self.installed.get(name)
+        parts = [
+            stamp(INSTALLED_DIR / name),
+            stamp(INSTALLED_DIR / name / 'installed.json'),
+            json.dumps(info, sort_keys=True, default=str) if info is not None else None,
+            stamp(self.objects.path(info['checksum'])) if info and info.get('checksum') else None,
+            stamp(Path(info['alp_file'])) if info and info.get('alp_file') else None,
+        ]
+        return hashlib.sha1(json.dumps(parts).encode()).hexdigest()
+    
+    def _doctor_package(self, name: str) -> Dict:
+        """Tek paketin kurulum ve bütünlük kontrolleri (iş parçacığında çalışır)"""
+        pkg_dir = INSTALLED_DIR / name
+        info = self.installed.get(name)
+        result = {"installs": [], "integrity": [], "orphan": False, "dangling": False,
+                  "missing_json": False, "record": None}
+        if not pkg_dir.is_dir():
+            if info is not None:
+                result["dangling"] = True
+                result["installs"].append(f"Kayıt var ama klasör yok: {name}")
+            return result
+        if info is None:
+            result["orphan"] = True
+            result["installs"].append(f"Kayıtsız kurulum klasörü bulundu: {name}")
+        inst_file = pkg_dir / 'installed.json'
+        if not inst_file.exists():
+            result["missing_json"] = True
+            result["installs"].append(f"Eksik installed.json: {name}")
+        else:
+            try:
+                with open(inst_file, 'r') as f:
+                    data = json.load(f)
+                if data.get('name') and data.get('name') != name:
+                    result["installs"].append(f"Ad uyuşmazlığı: klasör={name}, json={data.get('name')}")
+                elif info is None:
+                    result["record"] = data
+            except Exception as e:
+                result["installs"].append(f"installed.json bozuk: {name} ({e})")
+        
+        # Bütünlük (özetler cache'ten gelir, değişmeyen dosya için yalnızca stat)
+        if info:
+            expected = info.get('checksum')
+            script = self.objects.path(expected) if expected else None
+            if info.get('source') != 'local' and script and script.is_file():
+                if self.calculate_checksum(script) != expected:
+                    result["integrity"].append(f"{name}: depodaki kurulum scripti bozulmuş")
+            alp_file = info.get('alp_file')
+            if info.get('file_sha256') and alp_file and Path(alp_file).is_file():
+                if self.calculate_checksum(Path(alp_file)) != info['file_sha256']:
+                    result["integrity"].append(f"{name}: kaynak .alp dosyası kurulumdan sonra değişmiş")
+        return result
+    
+    def _doctor_cache(self) -> Dict:
+        """Cache dizinini tek geçişte (os.scandir) tara.
+        
+        Hiçbir bilinen paketin adına ya da kurulum kaydına bağlı olmayan
+        nesneler ve eski düzenden kalan <paket>_install.sh dosyaları artık sayılır.
+        """
+        known = set(self.packages) | set(self.installed)
+        live = {ref["sha256"] for name, ref in
+                ((n, self.objects.ref(n)) for n in self.objects.names())
+                if ref and name.split('/', 1)[0] in known}
+        live.update(info['checksum'] for info in self.installed.values() if info.get('checksum'))
+        total = 0
+        zero_files = []
+        stale_scripts = []
+        stack = [str(ALP_CACHE)] if ALP_CACHE.is_dir() else []
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        size = entry.stat(follow_symlinks=False).st_size
+                        total += size
+                        parent = os.path.dirname(entry.path)
+                        if size == 0 and not entry.name.endswith(('.partial', '.tmp')):
+                            zero_files.append(entry.path)
+                        elif parent == str(OBJECTS_DIR):
+                            if not entry.name.endswith(('.tmp', '.partial', '.partial.json')) and entry.name not in live:
+                                stale_scripts.append(entry.path)
+                        elif parent == str(ALP_CACHE) and entry.name.endswith(('_install.sh', '_uninstall.sh')):
+                            stale_scripts.append(entry.path)
+        return {"total": total, "zero_files": zero_files, "stale_scripts": stale_scripts}
+    
+    def _doctor_databases(self) -> List[str]:
+        import sqlite3
+        issues = []
+        if not PACKAGES_DB.exists():
+            issues.append("Paket veritabanı yok. 'alp update' çalıştırın.")
+        else:
+            try:
+                with open(PACKAGES_DB, 'r') as f:
+                    json.load(f)
+            except Exception as e:
+                issues.append(f"packages.json okunamadı: {e}")
+        try:
+            result = self.state.check()
+            if result != "ok":
+                issues.append(f"state.db bütünlük hatası: {result}")
+        except sqlite3.Error as e:
+            issues.append(f"state.db okunamadı: {e}")
+        return issues
+    
+    def doctor(self, fast: bool = False, fix: bool = False) -> bool:
+        """Sistem sağlığını kontrol et: bozuk kurulumlar, eksik bağımlılıklar, cache sorunları.
+        
+        Paket, cache ve veritabanı kontrolleri bir iş parçacığı havuzunda
+        paralel çalışır. Her paketin sonucu parmak iziyle birlikte
+        doctor.json'a yazılır; fast verilirse parmak izi değişmemiş paketler
+        yeniden denetlenmez. fix bulunan sorunları onarır. Sorun kalmazsa
+        True döner.
+        """
+        from concurrent.futures import ThreadPoolExecutor
         issues_dirs = []
-        issues_db = []
-        issues_installs = []
         issues_deps = []
         issues_cache = []
+        fixes = []
 
         # Dizin kontrolleri
         for path, name in [(ALP_HOME, 'ALP_HOME'), (ALP_CACHE, 'ALP_CACHE'), (ALP_LOGS, 'ALP_LOGS'), (INSTALLED_DIR, 'INSTALLED_DIR')]:
@@ -1151,80 +4303,142 @@ class PackageManager:
                 issues_dirs.append(f"Eksik dizin: {name} ({path})")
             elif not path.is_dir():
                 issues_dirs.append(f"Dizin değil: {name} ({path})")
+        if fix and issues_dirs:
+            self.setup_home()
+            fixes.append(f"Eksik dizinler oluşturuldu: {len(issues_dirs)}")
+            issues_dirs = []
 
-        # Veritabanı kontrolleri
-        if not PACKAGES_DB.exists():
-            issues_db.append("Paket veritabanı yok. 'alp update' çalıştırın.")
-        else:
+        journal = {}
+        if fast:
             try:
-                with open(PACKAGES_DB, 'r') as f:
-                    json.load(f)
-            except Exception as e:
-                issues_db.append(f"packages.json okunamadı: {e}")
-
-        if not INSTALLED_DB.exists():
-            issues_db.append("Yüklü paket veritabanı yok (hiç kurulum yapılmamış olabilir).")
-        else:
+                with open(DOCTOR_JOURNAL, 'r') as f:
+                    journal = json.load(f).get("packages", {})
+            except (OSError, ValueError):
+                journal = {}
+        
+        # Paylaşılan durumu havuzdan önce yükle
+        installed, packages, _ = self.installed, self.packages, self.checksums
+        names = sorted(set(installed) | {d.name for d in INSTALLED_DIR.glob('*') if d.is_dir()})
+        workers = max(1, int(self.config.get("doctor_workers", 8)))
+        results: Dict[str, Dict] = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            db_future = pool.submit(self._doctor_databases)
+            cache_future = pool.submit(self._doctor_cache)
+            # Parmak izleri yalnızca stat gerektirir; görev açmak hesaplamaktan pahalı
+            fingerprints = {name: self._doctor_fingerprint(name) for name in names}
+            pending = {}
+            for name in names:
+                entry = journal.get(name)
+                if entry and entry.get("fingerprint") == fingerprints[name]:
+                    results[name] = entry["result"]
+                else:
+                    pending[name] = pool.submit(self._doctor_package, name)
+            for name, future in pending.items():
+                results[name] = future.result()
+            issues_db = db_future.result()
+            cache = cache_future.result()
+        
+        # Onarım: kayıtsız klasörleri kaydet, sarkan kayıtları sil, eksik installed.json'u yaz
+        if fix:
+            changed = []
+            for name, result in results.items():
+                if result["dangling"]:
+                    del self.installed[name]
+                    self.reverse_deps.discard(name)
+                    changed.append(name)
+                    fixes.append(f"Klasörü olmayan kayıt silindi: {name}")
+                elif result["orphan"] and (result["record"] or name in packages):
+                    record = result["record"] or {
+                        **packages[name],
+                        'installed_at': datetime.fromtimestamp((INSTALLED_DIR / name).stat().st_mtime).isoformat(),
+                    }
+                    record['auto_installed'] = False
+                    record['disk_usage'] = self._measure_disk_usage(name)
+                    self.installed[name] = record
+                    self.reverse_deps.add(name, record.get('dependencies', []))
+                    changed.append(name)
+                    fixes.append(f"Kayıtsız klasör yeniden kaydedildi: {name}")
+                if result["missing_json"] and name in self.installed:
+                    with open(INSTALLED_DIR / name / 'installed.json', 'w') as f:
+                        json.dump(self.installed[name], f, indent=2)
+                    fixes.append(f"installed.json yeniden yazıldı: {name}")
+                elif name not in changed:
+                    continue
+                fingerprints.pop(name, None)
+                results[name] = self._doctor_package(name) if name in self.installed else None
+            if changed:
+                self.save_installed(*changed)
+                self.reverse_deps.save()
+            results = {name: r for name, r in results.items() if r is not None}
+        
+        # Parmak izi günlüğü: bir sonraki --fast çalıştırması değişmeyen paketleri atlar
+        if pending or fix or set(journal) != set(results):
             try:
-                with open(INSTALLED_DB, 'r') as f:
-                    json.load(f)
-            except Exception as e:
-                issues_db.append(f"installed.json okunamadı: {e}")
-
-        # Kurulum tutarlılık kontrolleri
-        installed_dirs = [d for d in INSTALLED_DIR.glob('*') if d.is_dir()]
-        for d in installed_dirs:
-            name = d.name
-            if name not in self.installed:
-                issues_installs.append(f"Kayıtsız kurulum klasörü bulundu: {name}")
-            inst_file = d / 'installed.json'
-            if not inst_file.exists():
-                issues_installs.append(f"Eksik installed.json: {name}")
-            else:
-                try:
-                    with open(inst_file, 'r') as f:
-                        data = json.load(f)
-                    if data.get('name') and data.get('name') != name:
-                        issues_installs.append(f"Ad uyuşmazlığı: klasör={name}, json={data.get('name')}")
-                except Exception as e:
-                    issues_installs.append(f"installed.json bozuk: {name} ({e})")
-
-        for name in list(self.installed.keys()):
-            if not (INSTALLED_DIR / name).exists():
-                issues_installs.append(f"Kayıt var ama klasör yok: {name}")
+                DOCTOR_JOURNAL.parent.mkdir(parents=True, exist_ok=True)
+                with open(DOCTOR_JOURNAL, 'w') as f:
+                    f.write(json.dumps({"packages": {
+                        name: {"fingerprint": fingerprints.get(name) or self._doctor_fingerprint(name), "result": result}
+                        for name, result in results.items()}}))
+            except OSError:
+                pass
+        
+        issues_installs = [msg for name in sorted(results) for msg in results[name]["installs"]]
+        issues_integrity = [msg for name in sorted(results) for msg in results[name]["integrity"]]
 
         # Bağımlılık kontrolleri (yalnızca yüklü paketler için)
+        missing_deps = []
         for name in list(self.installed.keys()):
-            deps = self.packages.get(name, {}).get('dependencies', [])
+            deps = packages.get(name, {}).get('dependencies', [])
             for dep in deps:
                 if dep not in self.installed:
                     issues_deps.append(f"{name} eksik bağımlılık: {dep}")
+                    if dep not in missing_deps:
+                        missing_deps.append(dep)
+        if fix and missing_deps:
+            installable = [dep for dep in missing_deps if dep in packages]
+            # JSON/NDJSON akışını bozmamak için kurulum çıktısı stderr'e gider
+            redirect = contextlib.redirect_stdout(sys.stderr) if self.output else contextlib.nullcontext()
+            with redirect:
+                installed_ok = bool(installable) and self.install_many(installable, as_dependency=True)
+            if installed_ok:
+                fixes.append(f"Eksik bağımlılıklar kuruldu: {', '.join(installable)}")
+                issues_deps = [msg for msg in issues_deps if msg.split(':')[-1].strip() not in installable]
 
         # Cache kontrolleri
-        total_cache_size = 0
-        zero_files = []
-        stale_scripts = 0
-        if ALP_CACHE.exists():
-            for f in ALP_CACHE.rglob('*'):
-                if f.is_file():
-                    size = f.stat().st_size
-                    total_cache_size += size
-                    if size == 0:
-                        zero_files.append(str(f))
-            for f in ALP_CACHE.glob('*_install.sh'):
-                pkgname = f.name.replace('_install.sh', '')
-                if pkgname not in self.packages and pkgname not in self.installed:
-                    stale_scripts += 1
+        if fix and (cache["zero_files"] or cache["stale_scripts"]):
+            for path in cache["zero_files"] + cache["stale_scripts"]:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            fixes.append(f"Cache dosyaları silindi: {len(cache['zero_files'])} boş, {len(cache['stale_scripts'])} artık script")
+            cache["zero_files"], cache["stale_scripts"] = [], []
         cache_limit_mb = self.config.get('cache_size', 1000)
-        cache_size_mb = total_cache_size / 1024 / 1024
+        cache_size_mb = cache["total"] / 1024 / 1024
+        if fix and cache_size_mb > cache_limit_mb:
+            evicted = self.cache.enforce(force=True)
+            fixes.append(f"Cache LRU ile küçültüldü: {evicted} girdi silindi")
+            cache_size_mb = self.cache.usage() / 1024 / 1024
         if cache_size_mb > cache_limit_mb:
             issues_cache.append(f"Cache boyutu limit aşıldı: {cache_size_mb:.2f}MB > {cache_limit_mb}MB")
-        if zero_files:
-            issues_cache.append(f"Cache içinde sıfır bayt dosyalar: {len(zero_files)} adet")
-        if stale_scripts:
-            issues_cache.append(f"Artık kurulum scriptleri: {stale_scripts} adet")
+        if cache["zero_files"]:
+            issues_cache.append(f"Cache içinde sıfır bayt dosyalar: {len(cache['zero_files'])} adet")
+        if cache["stale_scripts"]:
+            issues_cache.append(f"Artık kurulum scriptleri: {len(cache['stale_scripts'])} adet")
 
+        sections = [("dirs", "Dizinler", issues_dirs), ("databases", "Veritabanları", issues_db),
+                    ("installs", "Kurulumlar", issues_installs), ("dependencies", "Bağımlılıklar", issues_deps),
+                    ("integrity", "Bütünlük", issues_integrity), ("cache", "Cache", issues_cache)]
+        healthy = not any(items for _, _, items in sections)
+        if self.output:
+            self.output.records([{"check": "fix", "message": item} for item in fixes] +
+                                [{"check": key, "message": item} for key, _, items in sections for item in items])
+            return healthy
+        
         # Çıktı
+        print(f"\n{Colors.BOLD}{Colors.CYAN}🏥 Alp Doktor:{Colors.ENDC}")
+        print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}")
+        
         def section(title, items):
             print(f"  {Colors.BOLD}{title}:{Colors.ENDC}")
             if not items:
@@ -1237,11 +4451,14 @@ class PackageManager:
                     print(f"    (+{extra} daha)")
             print("")
 
-        section("Dizinler", issues_dirs)
-        section("Veritabanları", issues_db)
-        section("Kurulumlar", issues_installs)
-        section("Bağımlılıklar", issues_deps)
-        section("Cache", issues_cache)
+        for _, title, items in sections:
+            section(title, items)
+        
+        if fixes:
+            print(f"  {Colors.BOLD}Onarımlar:{Colors.ENDC}")
+            for item in fixes:
+                print(f"    {Colors.GREEN}✓{Colors.ENDC} {item}")
+            print("")
 
         # Öneriler
         suggestions = []
@@ -1253,14 +4470,18 @@ class PackageManager:
             missing_set = sorted({x.split(':')[-1].strip() for x in issues_deps})
             if missing_set:
                 suggestions.append(f"alp install {' '.join(missing_set[:3])}")
+        if not healthy and not fix:
+            suggestions.append("alp doctor --fix")
         if suggestions:
             print(f"  {Colors.BOLD}Öneriler:{Colors.ENDC}")
             for s in suggestions:
                 print(f"    {Colors.CYAN}→ {s}{Colors.ENDC}")
         print(f"{Colors.BOLD}{'-' * 80}{Colors.ENDC}\n")
+        return healthy
     
     def self_update(self) -> None:
         """Alp'in kendisini güncelle"""
+        import subprocess
         print(f"{Colors.BOLD}{Colors.CYAN}🔄 Alp Self-Update Başlıyor...{Colors.ENDC}\n")
         
         MANAGER_URL = "https://raw.githubusercontent.com/ATOMGAMERAGA/alp-repo/refs/heads/main/alp_manager.py"
@@ -1291,6 +4512,8 @@ class PackageManager:
             old_manager.unlink()
             new_manager.rename(old_manager)
             old_manager.chmod(0o755)
+            # Komut modül olarak içe aktarıldığı için bayt kodunu yeniden derle
+            subprocess.run(["python3", "-m", "compileall", "-q", str(INSTALL_DIR)], capture_output=True)
             
             logger.log("SUCCESS", "Alp başarıyla güncellendi!")
             print(f"\n{Colors.GREEN}✅ Yeni sürüm aktif. Komutu yeniden çalıştırın.{Colors.ENDC}\n")
@@ -1303,28 +4526,98 @@ class PackageManager:
         PACKAGES_DB.parent.mkdir(parents=True, exist_ok=True)
         with open(PACKAGES_DB, 'w') as f:
             json.dump(self.packages, f, indent=2, ensure_ascii=False)
+        # Arama indeksi kataloğun yanında, onunla aynı anda yenilenir
+        index = SearchIndex.build(self.packages)
+        index.save()
+        self.__dict__['search_index'] = index
     
-    def save_installed(self) -> None:
-        """Yüklü paketleri veritabanına kaydet"""
-        INSTALLED_DB.parent.mkdir(parents=True, exist_ok=True)
-        with open(INSTALLED_DB, 'w') as f:
-            json.dump(self.installed, f, indent=2, ensure_ascii=False)
+    def save_installed(self, *names: str) -> None:
+        """Yüklü paketleri veritabanına kaydet.
+        
+        Ad verilirse yalnızca o kayıtlar (silinmişse satırı silinerek) tek
+        işlemde yazılır; ad verilmezse tüm tablo eşitlenir.
+        """
+        self.state.sync("installed", self.installed, list(names) if names else None)
     
     def load_databases(self) -> None:
         """Veritabanlarını yükle"""
+        self._load_packages()
+        self._load_installed()
+    
+    def _load_packages(self) -> None:
+        self.packages = {}
         if PACKAGES_DB.exists():
             try:
                 with open(PACKAGES_DB, 'r') as f:
                     self.packages = json.load(f)
             except:
                 self.packages = {}
-        
-        if INSTALLED_DB.exists():
-            try:
-                with open(INSTALLED_DB, 'r') as f:
-                    self.installed = json.load(f)
-            except:
-                self.installed = {}
+    
+    def _load_installed(self) -> None:
+        import sqlite3
+        try:
+            self.installed = self.state.load("installed")
+        except (sqlite3.Error, ValueError):
+            self.installed = {}
+
+def _compile_worker(directory: str, options: Dict) -> Tuple[str, bool, str]:
+    """compile_many için süreç havuzunda çalışan derleme işi; çıktıyı yakalayıp döndürür"""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        try:
+            ok = PackageManager().compile_package(directory, **options)
+        except Exception as e:
+            logger.log("ERROR", f"Paket derlenemedi: {e}")
+            ok = False
+    # Havuz süreçleri atexit çalıştırmadan çıkabilir
+    logger.flush()
+    return directory, ok, buf.getvalue()
+
+def split_options(args: List[str], value_options: Tuple[str, ...] = ()) -> Tuple[List[str], Dict]:
+    """Argümanları konumsal olanlar ve --seçenekler olarak ayır.
+    
+    value_options içindeki seçenekler değer alır (--cert none ya da --cert=none);
+    diğer --seçenekler True olarak işaretlenir.
+    """
+    positional = []
+    options = {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg.startswith('--') and len(arg) > 2:
+            name, sep, value = arg[2:].partition('=')
+            if name in value_options and not sep:
+                value = args[i + 1] if i + 1 < len(args) else ""
+                i += 1
+            options[name] = value if name in value_options else True
+        else:
+            positional.append(arg)
+        i += 1
+    return positional, options
+
+def jobs_option(options: Dict) -> Optional[int]:
+    """--jobs değerini pozitif tamsayıya çevir; geçersizse hata verip çık"""
+    value = options.get("jobs")
+    if not value:
+        return None
+    try:
+        jobs = int(value)
+    except (TypeError, ValueError):
+        jobs = 0
+    if jobs < 1:
+        logger.log("ERROR", f"Geçersiz --jobs değeri: {value} (pozitif tamsayı olmalı)")
+        sys.exit(1)
+    return jobs
+
+def expand_directories(patterns: List[str]) -> List[str]:
+    """Dizin ve glob desenlerini sıralı, tekrarsız dizin listesine çevir"""
+    directories = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            if (not glob.has_magic(pattern) or os.path.isdir(match)) and match not in directories:
+                directories.append(match)
+    return directories
 
 def print_banner():
     print(f"""
@@ -1348,21 +4641,31 @@ def print_help():
     print(f"""{Colors.BOLD}Kullanım: alp <komut> [argümanlar]{Colors.ENDC}
  
 {Colors.BOLD}Paket Yönetimi:{Colors.ENDC}
-  {Colors.CYAN}update{Colors.ENDC}                  Depoyu güncelle
-  {Colors.CYAN}install <paket>{Colors.ENDC}         Paket yükle
-  {Colors.CYAN}remove <paket>{Colors.ENDC}          Paket kaldır
+  {Colors.CYAN}update{Colors.ENDC}                  Depoyu güncelle (yalnızca değişen repolar)
+  {Colors.CYAN}update --full{Colors.ENDC}           Tüm kataloğu baştan oluştur
+  {Colors.CYAN}install <paket>...{Colors.ENDC}      Paket(ler) yükle
+  {Colors.CYAN}remove <paket>{Colors.ENDC}          Paket kaldır (--deps: yetim bağımlılıklarla, --force: bağımlılar olsa da)
+  {Colors.CYAN}autoremove{Colors.ENDC}              Kullanılmayan bağımlılıkları kaldır
   {Colors.CYAN}upgrade [paket]{Colors.ENDC}         Paket güncelle (tümü veya belirli)
+  {Colors.CYAN}outdated{Colors.ENDC}                Güncellenebilir paketleri yerel katalogdan listele (ağsız)
+  {Colors.CYAN}mirror <dizin>{Colors.ENDC}          Kataloğun çevrimdışı aynasını oluştur (--jobs N)
   
 {Colors.BOLD}Paket İşlemleri:
   {Colors.CYAN}list{Colors.ENDC}                    Tüm paketleri listele
   {Colors.CYAN}list <kategori>{Colors.ENDC}        Kategoriye göre listele
-  {Colors.CYAN}installed{Colors.ENDC}              Yüklü paketleri listele
-  {Colors.CYAN}search <anahtar>{Colors.ENDC}       Paket ara
+  {Colors.CYAN}installed{Colors.ENDC}              Yüklü paketleri listele (--recompute: boyutları yeniden ölç)
+  {Colors.CYAN}search <sorgu>{Colors.ENDC}         Paket ara (author:, category:, license: filtreleri)
   {Colors.CYAN}info <paket>{Colors.ENDC}           Paket detaylarını göster
+  {Colors.CYAN}--json / --ndjson{Colors.ENDC}      list, installed, outdated, search, info, stats, doctor için makine okunur çıktı
   
 {Colors.BOLD}Geliştirici Araçları:
   {Colors.CYAN}compile <dizin>{Colors.ENDC}        Paket dizinini .alp dosyasına derle
+  {Colors.CYAN}compile <dizin|glob>... --cert <tür>{Colors.ENDC}  Çoklu paralel derleme
+                         (--cert custom/official/none, --signer, --jobs, --output)
   {Colors.CYAN}install-local <dosya>{Colors.ENDC}  Yerel .alp dosyasını kur
+  {Colors.CYAN}verify <dosya> [üye]{Colors.ENDC}   .alp paketini (veya tek üyesini) doğrula
+  {Colors.CYAN}diff <eski> <yeni>{Colors.ENDC}     İki paketin üyelerini özetlerine göre karşılaştır
+  {Colors.CYAN}index-build [dosya|dizin]{Colors.ENDC} Sıkıştırılmış depo indeksini (index.json.gz) oluştur
   
 {Colors.BOLD}Sertifika Sistemi:
   {Colors.CYAN}cert-info <paket>{Colors.ENDC}      Paket sertifikasını göster
@@ -1376,6 +4679,7 @@ def print_help():
 {Colors.BOLD}Sistem:
   {Colors.CYAN}stats{Colors.ENDC}                  İstatistikleri göster
   {Colors.CYAN}doctor{Colors.ENDC}                 Sağlık taraması (kurulum, bağımlılık, cache)
+                         (--fast: değişmeyen paketleri atla, --fix: bulunanları onar)
   {Colors.CYAN}clean{Colors.ENDC}                  Cache'i temizle
   {Colors.CYAN}self-update{Colors.ENDC}            Alp'i güncelle
   {Colors.CYAN}config{Colors.ENDC}                 Ayarları göster
@@ -1390,40 +4694,104 @@ def print_help():
   alp remove myapp
   alp upgrade
   alp search web
+  alp installed --ndjson         {Colors.YELLOW}# Satır başına bir JSON kaydı{Colors.ENDC}
         """)
  
 
 def main():
+    # Global çıktı kipi (--json / --ndjson) komutun neresinde olursa olsun ayıklanır
+    output_mode = None
+    for mode in RecordWriter.MODES:
+        if f"--{mode}" in sys.argv[1:]:
+            output_mode = mode
+            sys.argv = [arg for arg in sys.argv if arg != f"--{mode}"]
+    
     # Argüman yoksa yardım göster ve çık
     if len(sys.argv) < 2:
         print_help()
         return
     
+    if output_mode:
+        logger.plain_stderr = True
     mgr = PackageManager()
+    if output_mode:
+        mgr.output = RecordWriter(output_mode)
     cmd = sys.argv[1].lower()
     
     try:
         if cmd == "update":
-            mgr.update_repo(force=True)
+            mgr.update_repo(force=True, full="--full" in sys.argv[2:])
         elif cmd == "install" and len(sys.argv) > 2:
-            mgr.install(sys.argv[2])
+            if not mgr.install_many(sys.argv[2:]):
+                sys.exit(1)
         elif cmd == "remove" and len(sys.argv) > 2:
-            mgr.remove(sys.argv[2])
+            args, opts = split_options(sys.argv[2:])
+            ok = True
+            for name in args:
+                ok = mgr.remove(name, remove_deps=bool(opts.get("deps")), force=bool(opts.get("force"))) and ok
+            if not ok:
+                sys.exit(1)
+        elif cmd == "mirror" and len(sys.argv) > 2:
+            args, opts = split_options(sys.argv[2:], ("jobs",))
+            if not args or not mgr.mirror(args[0], jobs=jobs_option(opts)):
+                sys.exit(1)
+        elif cmd == "index-build":
+            args, opts = split_options(sys.argv[2:], ("jobs",))
+            if not mgr.build_index(args[0] if args else None, jobs=jobs_option(opts)):
+                sys.exit(1)
+        elif cmd == "autoremove":
+            if not mgr.autoremove():
+                sys.exit(1)
         elif cmd == "upgrade":
-            mgr.upgrade(sys.argv[2] if len(sys.argv) > 2 else None)
+            if not mgr.upgrade(sys.argv[2] if len(sys.argv) > 2 else None):
+                sys.exit(1)
+        elif cmd == "outdated":
+            if not mgr.outdated():
+                sys.exit(1)
         elif cmd == "list":
             category = sys.argv[2] if len(sys.argv) > 2 else None
-            mgr.list_packages(category)
+            if not mgr.list_packages(category):
+                sys.exit(1)
         elif cmd == "installed":
-            mgr.list_installed()
+            if not mgr.list_installed(recompute="--recompute" in sys.argv[2:]):
+                sys.exit(1)
         elif cmd == "search" and len(sys.argv) > 2:
-            mgr.search(sys.argv[2])
+            if not mgr.search(" ".join(sys.argv[2:])):
+                sys.exit(1)
         elif cmd == "info" and len(sys.argv) > 2:
-            mgr.show_info(sys.argv[2])
+            if not mgr.show_info(sys.argv[2]):
+                sys.exit(1)
         elif cmd == "compile" and len(sys.argv) > 2:
-            mgr.compile_package(sys.argv[2])
+            args, opts = split_options(sys.argv[2:], ("cert", "signer", "jobs", "output"))
+            directories = expand_directories(args)
+            cert_choice = opts.get("cert") or os.environ.get("ALP_CERT")
+            compile_opts = {
+                "cert_choice": cert_choice,
+                "signer": opts.get("signer") or os.environ.get("ALP_SIGNER"),
+                "password": os.environ.get("ALP_OFFICIAL_PASSWORD"),
+                "output_dir": opts.get("output"),
+            }
+            if not directories:
+                logger.log("ERROR", "Derlenecek dizin bulunamadı")
+                sys.exit(1)
+            if len(directories) == 1:
+                ok = mgr.compile_package(directories[0], **compile_opts)
+            elif cert_choice is None:
+                logger.log("ERROR", "Toplu derlemede --cert (veya ALP_CERT) zorunludur: custom/official/none")
+                sys.exit(2)
+            else:
+                ok = mgr.compile_many(directories, jobs=jobs_option(opts), **compile_opts)
+            if not ok:
+                sys.exit(1)
         elif cmd == "install-local" and len(sys.argv) > 2:
-            mgr.install_local_package(sys.argv[2])
+            if not mgr.install_local_package(sys.argv[2]):
+                sys.exit(1)
+        elif cmd == "verify" and len(sys.argv) > 2:
+            if not mgr.verify_package(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None):
+                sys.exit(1)
+        elif cmd == "diff" and len(sys.argv) > 3:
+            if not mgr.diff_packages(sys.argv[2], sys.argv[3]):
+                sys.exit(1)
         elif cmd == "cert-info" and len(sys.argv) > 2:
             mgr.cert_manager.show_certificate_info(sys.argv[2])
         elif cmd == "cert-create":
@@ -1446,9 +4814,13 @@ def main():
             else:
                 print(f"{Colors.YELLOW}ℹ️  Kullanım: alp cert-scan <github_url>{Colors.ENDC}")
         elif cmd == "stats":
-            mgr.stats()
+            if not mgr.stats(recompute="--recompute" in sys.argv[2:]):
+                sys.exit(1)
         elif cmd == "doctor":
-            mgr.doctor()
+            healthy = mgr.doctor(fast="--fast" in sys.argv[2:], fix="--fix" in sys.argv[2:])
+            # Metin kipinde çıkış kodu değişmez; sorun durumu yalnızca makine kipinde 1 döner
+            if not healthy and mgr.output:
+                sys.exit(1)
         elif cmd == "clean":
             mgr.clean_cache()
         elif cmd == "self-update":
@@ -1459,6 +4831,12 @@ def main():
             print_help()
         else:
             logger.log("ERROR", f"Bilinmeyen komut: {cmd}")
+            sys.exit(2)
+    except BrokenPipeError:
+        # Okuyucu erken kapandı (örn. | head): sessizce çık, kapanışta stdout tekrar yazılmasın
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
     except KeyboardInterrupt:
         print(f"\n{Colors.YELLOW}⚠️  İşlem iptal edildi{Colors.ENDC}")
         sys.exit(130)
@@ -148,9 +148,12 @@ download_manager() {
 create_bin_wrapper() {
     log_info "Sistem komutu oluşturuluyor..."
     
+    # Betik olarak çalıştırılan dosyanın bayt kodu cache'lenmez; modül olarak
+    # içe aktarıp önceden derlenmiş .pyc dosyasını kullan
+    python3 -m compileall -q "$INSTALL_DIR" >/dev/null 2>&1 || true
     cat > "$BIN_DIR/alp" << 'WRAPPER_EOF'
 #!/bin/bash
-exec python3 /usr/local/lib/alp/alp_manager.py "$@"
+exec python3 -c 'import sys; sys.path.insert(0, "/usr/local/lib/alp"); from alp_manager import main; main()' "$@"
 WRAPPER_EOF
     
     chmod +x "$BIN_DIR/alp"
@@ -232,8 +235,8 @@ Alp veritabanları ve yapılandırması
 .B ~/.alp/packages.json
 Kullanılabilir paketler
 .TP
-.B ~/.alp/installed.json
-Yüklü paketler
+.B ~/.alp/state.db
+Yüklü paketler ve sertifikalar (SQLite, WAL)
 .TP
 .B ~/.alp/config.json
 Alp yapılandırması
@@ -344,6 +347,7 @@ if curl -s -L "$MANAGER_URL" -o "$INSTALL_DIR/alp_manager.py.new" 2>/dev/null; t
         # Eski sürümü sil, yenisini taşı
         rm -f "$INSTALL_DIR/alp_manager.py"
         mv "$INSTALL_DIR/alp_manager.py.new" "$INSTALL_DIR/alp_manager.py"
+        python3 -m compileall -q "$INSTALL_DIR" >/dev/null 2>&1 || true
         
         # Backup'ı temizle
         rm -rf "$BACKUP_DIR"
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Alp başlangıç süresi regresyon kontrolü.
+
+Hafif komutların (help, config, installed, outdated) ağır modülleri yüklemediğini ve
+Python'un kendi açılışına göre eklenen süreyi bütçe içinde tuttuğunu doğrular.
+Kullanım: python3 startup_check.py [bütçe_ms]  (varsayılan: STARTUP_BUDGET_MS ya da 120)
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+# Komut -> kullanması beklenen ağır modüller
+COMMANDS = {"help": [], "config": [], "installed": ["sqlite3"], "outdated": ["sqlite3"]}
+RUNS = 7
+# Bu komutlar için yüklenmemesi gereken modüller
+HEAVY_MODULES = [
+    "subprocess", "tarfile", "tempfile", "sqlite3", "shutil", "gzip",
+    "urllib.request", "http.client", "concurrent.futures",
+]
+LAUNCHER = "import sys; sys.path.insert(0, {path!r}); from alp_manager import main; main()"
+PROBE = ("import sys, json; sys.path.insert(0, {path!r}); sys.argv = ['alp', {cmd!r}]; "
+         "import alp_manager; alp_manager.main(); "
+         "print(json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)), file=sys.stderr)")
+
+
+def median_ms(argv, env) -> float:
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(argv, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main() -> int:
+    budget = float(sys.argv[1] if len(sys.argv) > 1 else os.environ.get("STARTUP_BUDGET_MS", 120))
+    subprocess.run([sys.executable, "-m", "compileall", "-q", str(HERE / "alp_manager.py")], check=True)
+    env = {**os.environ, "HOME": tempfile.mkdtemp(prefix="alp-startup-")}
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    failed = False
+
+    baseline = median_ms([sys.executable, "-c", "pass"], env)
+    print(f"Python açılışı: {baseline:.1f} ms (bütçe: +{budget:.0f} ms)")
+    for cmd, allowed in COMMANDS.items():
+        heavy = [m for m in HEAVY_MODULES if m not in allowed]
+        probe = subprocess.run(
+            [sys.executable, "-c", PROBE.format(path=str(HERE), cmd=cmd, heavy=heavy)],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        loaded = probe.stderr.strip().splitlines()[-1] if probe.stderr.strip() else "[]"
+        elapsed = median_ms([sys.executable, "-c", LAUNCHER.format(path=str(HERE)), cmd], env)
+        overhead = elapsed - baseline
+        ok = overhead <= budget and loaded == "[]"
+        failed = failed or not ok
+        print(f"  {'✓' if ok else '✗'} alp {cmd:<10} {elapsed:6.1f} ms (+{overhead:.1f} ms)"
+              + ("" if loaded == "[]" else f"  ağır modüller: {loaded}"))
+
+    if failed:
+        print("❌ Başlangıç süresi regresyonu")
+        return 1
+    print("✅ Başlangıç süresi bütçe içinde")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())